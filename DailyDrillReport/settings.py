@@ -93,7 +93,6 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'accounts.middleware.UserProfileMiddleware',
 ]
 
 ROOT_URLCONF = 'DailyDrillReport.urls'
@@ -133,9 +132,33 @@ DATABASES = {
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
         'CONN_MAX_AGE': 600 if config('DB_ENGINE', default='django.db.backends.sqlite3').startswith('django.db.backends.postgresql') else 0,
+        'TEST': {
+            # SQLite tests run in memory unless a file is named here; a file
+            # lets `manage.py test --keepdb` skip migrations on later runs
+            'NAME': config('TEST_DB_NAME', default=None),
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at Redis or
+# Memcached in production so all workers share one cache, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
     }
 }
 
+# Sessions are read from the cache and only fall back to the database on a miss
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,6 +179,21 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# Django's defaults, plus a cheaper PBKDF2 variant for admin-issued temporary
+# client passwords; those are upgraded to the first hasher on login.
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'accounts.hashers.TemporaryPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -190,6 +228,11 @@ STATICFILES_FINDERS = [
 import sys
 if 'test' in sys.argv:
     STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    # PBKDF2 dominates test setup time; a fast hasher is fine for throwaway users
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'accounts.hashers.TemporaryPasswordHasher',
+    ]
 else:
     STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
@@ -203,6 +246,13 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Auth settings
+# Loads UserProfile/Client with the user in one query (see accounts/auth_backends.py).
+# New logins use the first backend; ModelBackend stays listed so sessions that
+# stored its path before the switch keep resolving instead of being logged out.
+AUTHENTICATION_BACKENDS = [
+    'accounts.auth_backends.ProfileCachingBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
 LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'core:shift_list'
 LOGOUT_REDIRECT_URL = 'accounts:login'
@@ -1,8 +1,7 @@
 from django.contrib.auth.views import LoginView
-from django.contrib import messages
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.db import transaction
+from django.contrib.auth.models import User
 from .models import UserProfile
 
 
@@ -10,23 +9,21 @@ class CustomLoginView(LoginView):
     template_name = 'accounts/login.html'
     
     def form_valid(self, form):
-        try:
+        authenticated = form.get_user()
+        # Reload the user with the profile and client link in one JOIN and let
+        # login() use this instance, so get_success_url needs no further query
+        user = User.objects.select_related('profile', 'client_profile').get(pk=authenticated.pk)
+        user.backend = authenticated.backend
+        form.user_cache = user
+        profile = getattr(user, 'profile', None)
+        if profile is None:
+            # Keep the transaction to the profile write; the session rotation
+            # and redirect below don't need to hold it open
             with transaction.atomic():
-                user = form.get_user()
-                # Explicitly try to access the profile
-                try:
-                    profile = user.profile
-                    self.request.session['profile_id'] = profile.id
-                except UserProfile.DoesNotExist:
-                    profile = UserProfile.objects.create(user=user)
-                    self.request.session['profile_id'] = profile.id
-                
-                response = super().form_valid(form)
-                return response
-                
-        except Exception as e:
-            messages.error(self.request, f"Login error: {str(e)}")
-            return redirect('accounts:login')
+                profile, _ = UserProfile.objects.get_or_create(user=user)
+        self.request.session['profile_id'] = profile.id
+
+        return super().form_valid(form)
 
     def get_success_url(self):
         """Redirect users based on role/profile after login.
@@ -39,19 +36,17 @@ class CustomLoginView(LoginView):
         if redirect_to:
             return redirect_to
 
+        # form_valid logged in a user loaded with its profile and client link
         user = self.request.user
         # If linked to a Client (core.Client.user OneToOne), send to client dashboard
-        if hasattr(user, 'client_profile') and user.client_profile is not None:
+        if getattr(user, 'client_profile', None) is not None:
             return reverse_lazy('core:client_dashboard')
 
         # Otherwise, route by role if available
-        try:
-            if user.profile.role == UserProfile.ROLE_MANAGER or user.profile.role == UserProfile.ROLE_SUPERVISOR:
-                return reverse_lazy('core:shift_list')
-            if user.profile.role == UserProfile.ROLE_CLIENT:
-                return reverse_lazy('core:client_dashboard')
-        except Exception:
-            # No profile or role; fall back
-            pass
+        role = getattr(getattr(user, 'profile', None), 'role', None)
+        if role == UserProfile.ROLE_MANAGER or role == UserProfile.ROLE_SUPERVISOR:
+            return reverse_lazy('core:shift_list')
+        if role == UserProfile.ROLE_CLIENT:
+            return reverse_lazy('core:client_dashboard')
 
         return reverse_lazy('core:shift_list')
\ No newline at end of file
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileCachingBackend(ModelBackend):
+    """
+    ModelBackend that loads the user's profile and client link with the user.
+
+    AuthenticationMiddleware resolves request.user through get_user() on every
+    authenticated request; joining the UserProfile and Client rows here means
+    get_profile() and the role checks read them without separate queries.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(
+                'profile', 'client_profile'
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -2,6 +2,7 @@ from functools import wraps
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 from django.contrib import messages
+from .utils import get_profile
 
 
 def role_required(roles):
@@ -10,29 +11,26 @@ def role_required(roles):
     Args:
         roles: String or list of role names
     """
+    # Built once when the view is decorated rather than on every request
+    allowed_roles = frozenset([roles] if isinstance(roles, str) else roles)
+
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
-            if not request.user.is_authenticated:
+            user = request.user
+            if not user.is_authenticated:
                 messages.warning(request, 'Please login to continue.')
                 return redirect('accounts:login')
             
-            if not hasattr(request.user, 'profile'):
-                messages.error(request, 'User profile not found.')
-                return redirect('accounts:login')
-            
             # Superusers can access everything
-            if request.user.is_superuser:
+            if user.is_superuser:
                 return view_func(request, *args, **kwargs)
             
-            if isinstance(roles, str):
-                allowed_roles = [roles]
-            else:
-                allowed_roles = roles
-            
-            if request.user.profile.role not in allowed_roles:
-                messages.error(request, 'You do not have permission to perform this action.')
-                raise PermissionDenied('Insufficient permissions')
+            # Always read the current profile (cached, and invalidated when
+            # the profile is saved) so role changes apply immediately
+            if get_profile(request).role not in allowed_roles:
+                # Shown by the 403 template; no need to queue a session message
+                raise PermissionDenied('You do not have permission to perform this action.')
             
             return view_func(request, *args, **kwargs)
         return _wrapped_view
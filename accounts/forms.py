@@ -33,17 +33,13 @@ class UserRegistrationForm(UserCreationForm):
         user.email = self.cleaned_data['email']
         if commit:
             user.save()
-            # Ensure profile exists and update it
-            try:
-                profile = user.profile
-            except Exception:
-                from .models import UserProfile
-                profile, _ = UserProfile.objects.get_or_create(user=user)
-
-            profile.role = self.cleaned_data.get('role', profile.role)
-            profile.company = self.cleaned_data.get('company', profile.company)
-            profile.phone = self.cleaned_data.get('phone', profile.phone)
-            profile.save()
+            # The post_save signal created a blank profile (cached on user,
+            # which login() re-saves later); fill it in explicitly
+            profile = user.profile
+            profile.role = self.cleaned_data.get('role', UserProfile.ROLE_SUPERVISOR)
+            profile.company = self.cleaned_data.get('company', '')
+            profile.phone = self.cleaned_data.get('phone', '')
+            profile.save(update_fields=['role', 'company', 'phone'])
         return user
 
 
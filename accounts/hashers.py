@@ -0,0 +1,15 @@
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TemporaryPasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with a reduced work factor for admin-issued temporary passwords.
+
+    Used by the client-login admin action, which hashes one random
+    12-character password per selected client; at the default iteration count
+    that is ~100ms of CPU each. It is listed after the default hasher in
+    PASSWORD_HASHERS, so Django re-hashes the password with the default on the
+    client's first successful login.
+    """
+    algorithm = 'pbkdf2_sha256_temp'
+    iterations = 10000
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 import os
 
 User = get_user_model()
@@ -18,17 +19,23 @@ class Command(BaseCommand):
             )
             return
 
-        if User.objects.filter(username=username).exists():
+        # The password default is a callable so it is only hashed when the
+        # user is actually created; re-runs on a warm database skip PBKDF2
+        user, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                'email': email,
+                'is_staff': True,
+                'is_superuser': True,
+                'password': lambda: make_password(password),
+            },
+        )
+        if not created:
             self.stdout.write(
                 self.style.SUCCESS(f'Superuser "{username}" already exists')
             )
             return
 
-        User.objects.create_superuser(
-            username=username,
-            email=email,
-            password=password
-        )
         self.stdout.write(
             self.style.SUCCESS(f'Superuser "{username}" created successfully')
         )
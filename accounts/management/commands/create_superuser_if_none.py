@@ -9,12 +9,9 @@ class Command(BaseCommand):
     help = 'Create a superuser if none exists and environment variables are set'
 
     def handle(self, *args, **options):
-        # Check if any superuser already exists
-        if User.objects.filter(is_superuser=True).exists():
-            self.stdout.write(self.style.SUCCESS('Superuser already exists. Skipping creation.'))
-            return
-
-        # Get credentials from environment variables
+        # Get credentials from environment variables first; decouple parses
+        # .env once and serves these from memory, so an unconfigured run
+        # returns without touching the database
         username = config('DJANGO_SUPERUSER_USERNAME', default=None)
         email = config('DJANGO_SUPERUSER_EMAIL', default=None)
         password = config('DJANGO_SUPERUSER_PASSWORD', default=None)
@@ -25,6 +22,23 @@ class Command(BaseCommand):
             ))
             return
 
+        # Check if any superuser already exists
+        if User.objects.filter(is_superuser=True).exists():
+            self.stdout.write(self.style.SUCCESS('Superuser already exists. Skipping creation.'))
+            return
+
+        # Look the username up on its unique index; an existing regular
+        # account would otherwise only surface as an IntegrityError below
+        try:
+            existing = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            existing = None
+        if existing is not None:
+            self.stdout.write(self.style.WARNING(
+                f'User "{existing.get_username()}" already exists but is not a superuser. Skipping creation.'
+            ))
+            return
+
         # Create the superuser
         try:
             User.objects.create_superuser(
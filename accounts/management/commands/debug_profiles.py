@@ -7,18 +7,20 @@ class Command(BaseCommand):
     help = 'Debug user profiles'
 
     def handle(self, *args, **options):
-        users = User.objects.all()
-        self.stdout.write(f'Found {users.count()} users')
-        
+        # One JOIN for every user and profile instead of a SELECT per user
+        users = list(User.objects.select_related('profile').order_by('pk'))
+        self.stdout.write(f'Found {len(users)} users')
+
+        missing = [UserProfile(user=user) for user in users if not hasattr(user, 'profile')]
+        if missing:
+            UserProfile.objects.bulk_create(missing, ignore_conflicts=True)
+        created = {profile.user_id for profile in missing}
+
         for user in users:
             self.stdout.write(f'\nUser: {user.username}')
-            self.stdout.write(f'Has profile attr: {hasattr(user, "profile")}')
-            try:
-                profile = UserProfile.objects.get(user=user)
-                self.stdout.write(f'Found profile: {profile}')
-            except UserProfile.DoesNotExist:
-                self.stdout.write(f'No profile found - creating one')
-                profile = UserProfile.objects.create(user=user)
-                self.stdout.write(f'Created profile: {profile}')
-            except Exception as e:
-                self.stdout.write(f'Error: {str(e)}')
\ No newline at end of file
+            if user.pk in created:
+                self.stdout.write('Has profile attr: False')
+                self.stdout.write('No profile found - created one')
+            else:
+                self.stdout.write('Has profile attr: True')
+                self.stdout.write(f'Found profile: {user.profile}')
@@ -1,10 +1,20 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from typing import Optional
 
 
+# Seconds a cached UserProfile stays valid (see accounts.utils.get_profile)
+PROFILE_CACHE_TIMEOUT = 60
+
+
+def profile_cache_key(user_id) -> str:
+    """Cache key under which a user's UserProfile is memoized."""
+    return f"user_profile:{user_id}"
+
+
 class UserProfile(models.Model):
     """
     Extended user profile with role-based access control.
@@ -61,20 +71,31 @@ class UserProfile(models.Model):
 
 # Signal to create/update UserProfile when User is created/updated
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
+def create_or_update_user_profile(sender, instance, created, raw=False, **kwargs):
     """
     Signal handler to automatically create or update UserProfile.
     
     Creates a new UserProfile when a User is created.
     Saves the profile when an existing User is updated.
+    Fixture loading (``raw``) is skipped; fixtures carry their own profiles.
     
     Args:
         sender: The User model class
         instance: The actual User instance being saved
         created: Boolean indicating if this is a new User
+        raw: True when the User is being saved by loaddata
         **kwargs: Additional signal arguments
     """
+    if raw:
+        return
     if created:
         UserProfile.objects.create(user=instance)
     else:
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_user_profile_cache(sender, instance, **kwargs):
+    """Drop the memoized profile so the next request reloads it."""
+    cache.delete(profile_cache_key(instance.user_id))
@@ -1,5 +1,7 @@
 from django.test import TestCase, RequestFactory
 from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponse
 from accounts.models import UserProfile
@@ -10,33 +12,30 @@ from accounts.decorators import (
 
 
 class DecoratorsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Create users with different roles plus a superuser in bulk; the
+        # post_save signal does not fire, so profiles are created alongside
+        password = make_password('pass123')
+        cls.supervisor, cls.manager, cls.client_user, cls.admin = User.objects.bulk_create([
+            User(username='supervisor', password=password),
+            User(username='manager', password=password),
+            User(username='client', password=password),
+            User(username='admin', password=password, email='admin@test.com',
+                 is_staff=True, is_superuser=True),
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=cls.supervisor, role=UserProfile.ROLE_SUPERVISOR),
+            UserProfile(user=cls.manager, role=UserProfile.ROLE_MANAGER),
+            UserProfile(user=cls.client_user, role=UserProfile.ROLE_CLIENT),
+            UserProfile(user=cls.admin),
+        ])
+
     def setUp(self):
+        # Profiles memoized by get_profile() would outlive each test's rollback
+        cache.clear()
         self.factory = RequestFactory()
         
-        # Create users with different roles
-        self.supervisor = User.objects.create_user(
-            username='supervisor', password='pass123'
-        )
-        self.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.supervisor.profile.save()
-        
-        self.manager = User.objects.create_user(
-            username='manager', password='pass123'
-        )
-        self.manager.profile.role = UserProfile.ROLE_MANAGER
-        self.manager.profile.save()
-        
-        self.client_user = User.objects.create_user(
-            username='client', password='pass123'
-        )
-        self.client_user.profile.role = UserProfile.ROLE_CLIENT
-        self.client_user.profile.save()
-        
-        # Create a superuser
-        self.admin = User.objects.create_superuser(
-            username='admin', password='pass123', email='admin@test.com'
-        )
-        
         # Create a mock view for testing
         self.mock_view = lambda request: HttpResponse('OK')
 
@@ -148,4 +147,21 @@ class DecoratorsTestCase(TestCase):
         # Should fail for client
         request.user = self.client_user
         with self.assertRaises(PermissionDenied):
-            approve_view(request)
\ No newline at end of file
+            approve_view(request)
+
+    def test_role_change_applies_without_new_login(self):
+        """The current profile role is checked, not one remembered at login."""
+        view = manager_required(self.mock_view)
+        request = self.factory.get('/')
+        # Left over from sessions created before roles stopped being cached
+        request.session = {'user_role': UserProfile.ROLE_MANAGER}
+        request.user = User.objects.get(pk=self.manager.pk)
+        self.assertEqual(view(request).status_code, 200)
+
+        # Demote the manager; the next request loads a fresh user
+        profile = UserProfile.objects.get(user=self.manager)
+        profile.role = UserProfile.ROLE_CLIENT
+        profile.save()
+        request.user = User.objects.get(pk=self.manager.pk)
+        with self.assertRaises(PermissionDenied):
+            view(request)
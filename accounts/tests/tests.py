@@ -1,40 +1,32 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
-from .models import UserProfile
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from accounts.auth_backends import ProfileCachingBackend
+from accounts.models import UserProfile, profile_cache_key
 
 
 class AccountsTestCase(TestCase):
     def setUp(self):
         # Create test users with different roles
         self.client = Client()
-        
-        # Create a supervisor
-        self.supervisor = User.objects.create_user(
-            username='supervisor',
-            password='testpass123',
-            email='supervisor@test.com'
-        )
-        self.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.supervisor.profile.save()
-        
-        # Create a manager
-        self.manager = User.objects.create_user(
-            username='manager',
-            password='testpass123',
-            email='manager@test.com'
-        )
-        self.manager.profile.role = UserProfile.ROLE_MANAGER
-        self.manager.profile.save()
-        
-        # Create a client user
-        self.client_user = User.objects.create_user(
-            username='client',
-            password='testpass123',
-            email='client@test.com'
-        )
-        self.client_user.profile.role = UserProfile.ROLE_CLIENT
-        self.client_user.profile.save()
+
+        # Create the supervisor, manager and client users and their profiles
+        # in two bulk INSERTs; bulk_create skips the post_save signal, so the
+        # profiles are created here with their roles already set. The password
+        # is hashed once and shared by every user.
+        password = make_password('testpass123')
+        roles = [UserProfile.ROLE_SUPERVISOR, UserProfile.ROLE_MANAGER, UserProfile.ROLE_CLIENT]
+        self.supervisor, self.manager, self.client_user = User.objects.bulk_create([
+            User(username='supervisor', email='supervisor@test.com', password=password),
+            User(username='manager', email='manager@test.com', password=password),
+            User(username='client', email='client@test.com', password=password),
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, role=role)
+            for user, role in zip([self.supervisor, self.manager, self.client_user], roles)
+        ])
 
     def test_user_registration(self):
         """Test user registration process."""
@@ -131,4 +123,21 @@ class AccountsTestCase(TestCase):
         client = User.objects.get(username='client')
         self.assertTrue(client.profile.is_client)
         self.assertFalse(client.profile.is_supervisor)
-        self.assertFalse(client.profile.is_manager)
\ No newline at end of file
+        self.assertFalse(client.profile.is_manager)
+
+    def test_profile_cache_invalidated_on_save(self):
+        """Test the cached profile is dropped when the profile changes."""
+        profile = UserProfile.objects.get(user=self.supervisor)
+        key = profile_cache_key(self.supervisor.pk)
+        cache.set(key, profile)
+        self.assertEqual(cache.get(key).role, UserProfile.ROLE_SUPERVISOR)
+
+        profile.role = UserProfile.ROLE_MANAGER
+        profile.save()
+        self.assertIsNone(cache.get(key))
+
+    def test_backend_loads_profile_with_user(self):
+        """Test the auth backend joins the profile so reading it needs no query."""
+        user = ProfileCachingBackend().get_user(self.manager.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.profile.role, UserProfile.ROLE_MANAGER)
@@ -0,0 +1,55 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from .models import UserProfile, profile_cache_key, PROFILE_CACHE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Reverse one-to-one relation holding the per-instance profile cache
+_profile_relation = User.profile.related
+
+
+def get_profile(request):
+    """
+    Return the requesting user's UserProfile, creating it if it is missing.
+
+    Replaces the old UserProfileMiddleware so only views and decorators that
+    need the profile pay for it. ProfileCachingBackend normally loads the
+    profile together with request.user, in which case no query is made;
+    users loaded any other way are served from the cache before falling back
+    to the database. The result is memoized on the user for the rest of the
+    request.
+
+    Args:
+        request: HTTP request object
+
+    Returns:
+        UserProfile instance, or None for anonymous users
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return None
+
+    if _profile_relation.is_cached(user):
+        profile = _profile_relation.get_cached_value(user)
+    else:
+        key = profile_cache_key(user.pk)
+        profile = cache.get(key)
+        if profile is None:
+            profile = UserProfile.objects.only(
+                'id', 'role', 'company', 'phone', 'user_id'
+            ).filter(user_id=user.pk).first()
+            if profile is not None:
+                cache.set(key, profile, PROFILE_CACHE_TIMEOUT)
+
+    if profile is None:
+        with transaction.atomic():
+            # Create a profile if it doesn't exist
+            profile, created = UserProfile.objects.get_or_create(user=user)
+        if created:
+            logger.info("Profile auto-created for user_id=%s", user.pk)
+
+    _profile_relation.set_cached_value(user, profile)
+    return profile
@@ -4,6 +4,7 @@ from django.contrib import messages
 from .forms import UserProfileForm
 from .forms import UserRegistrationForm
 from django.contrib.auth import login
+from .utils import get_profile
 
 
 @login_required
@@ -24,13 +25,14 @@ def profile_view(request):
         User must be authenticated (enforced by @login_required decorator)
     """
     if request.method == 'POST':
-        form = UserProfileForm(request.POST, instance=request.user.profile)
+        form = UserProfileForm(request.POST, instance=get_profile(request))
         if form.is_valid():
-            form.save()
+            profile = form.save(commit=False)
+            profile.save(update_fields=UserProfileForm.Meta.fields)
             messages.success(request, 'Your profile has been updated.')
             return redirect('accounts:profile')
     else:
-        form = UserProfileForm(instance=request.user.profile)
+        form = UserProfileForm(instance=get_profile(request))
     
     return render(request, 'accounts/profile.html', {'form': form})
 
@@ -60,8 +62,9 @@ def register_view(request):
         form = UserRegistrationForm(request.POST)
         if form.is_valid():
             user = form.save()
-            # Automatically log the user in after registration
-            login(request, user)
+            # Automatically log the user in after registration; the user was
+            # not authenticated, so name the backend explicitly
+            login(request, user, backend='accounts.auth_backends.ProfileCachingBackend')
             messages.success(request, 'Registration successful. You are now logged in.')
             return redirect('core:shift_list')
     else:
@@ -2,8 +2,19 @@ from django.contrib import admin
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib import messages
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 from django.utils.crypto import get_random_string
+from accounts.hashers import TemporaryPasswordHasher
+from accounts.models import UserProfile
 from .models import Client, DrillShift, DrillingProgress, ActivityLog, MaterialUsed, ApprovalHistory, Survey, Casing
 
 # Customize admin site
@@ -12,6 +23,68 @@ admin.site.site_title = getattr(settings, 'ADMIN_SITE_TITLE', 'Leos Admin')
 admin.site.index_title = getattr(settings, 'ADMIN_INDEX_TITLE', 'Daily Shift Report Administration')
 
 
+class LargeTablePaginator(Paginator):
+    """
+    Paginator that estimates the row count of unfiltered changelists.
+
+    COUNT(*) on a large PostgreSQL table scans the whole table, so when the
+    changelist has no filters or search the planner's estimate from
+    pg_class.reltuples is used instead. Filtered querysets, other databases
+    and tables that have not been analyzed yet fall back to the exact count.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples FROM pg_class WHERE relname = %s",
+                        [self.object_list.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] > 0:
+                    return int(row[0])
+        return super().count
+
+
+class ListDisplayChangeList(ChangeList):
+    """ChangeList that only SELECTs the columns the changelist displays."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        fields = self.model_admin.get_changelist_only_fields(request)
+        # Relations joined by get_queryset()/list_select_related can't be deferred
+        if isinstance(queryset.query.select_related, dict):
+            fields += [name for name in queryset.query.select_related if name not in fields]
+        return queryset.only(*fields)
+
+
+class ListDisplayOnlyMixin:
+    """
+    Admin mixin that keeps wide columns (notes, remarks, file paths) that are
+    not in list_display out of the changelist query. Change and delete views
+    use the regular queryset and still load complete rows.
+    """
+
+    def get_changelist(self, request, **kwargs):
+        return ListDisplayChangeList
+
+    def get_changelist_only_fields(self, request):
+        opts = self.model._meta
+        fields = [opts.pk.name]
+        for name in self.get_list_display(request):
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and field.name not in fields:
+                fields.append(field.name)
+        return fields
+
+
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
     list_display = ('name', 'contact_person', 'email', 'phone', 'user', 'is_active', 'created_at')
@@ -27,7 +100,8 @@ class ClientAdmin(admin.ModelAdmin):
             'description': 'Link to user account for client login. Create a user first, then link here.'
         }),
     )
-    raw_id_fields = ('user',)
+    # Django's built-in UserAdmin provides the search_fields autocomplete requires
+    autocomplete_fields = ('user',)
     
     fieldsets = (
         ('Company Information', {
@@ -42,60 +116,90 @@ class ClientAdmin(admin.ModelAdmin):
     actions = ['create_or_reset_client_login']
 
     @admin.action(description="Create/Reset client login and show temporary password")
+    @transaction.atomic(savepoint=False)
     def create_or_reset_client_login(self, request, queryset):
-        created = 0
-        updated = 0
-        for client in queryset:
-            # Generate a username based on client name
-            base_username = slugify(client.name)[:20] or 'client'
-            username = base_username
-            suffix = 1
-            # Find unique username if creating new
-            if not client.user:
-                while User.objects.filter(username=username).exists():
-                    suffix += 1
-                    username = f"{base_username}{suffix}"
+        clients = list(queryset.select_related('user', 'user__profile'))
+
+        # Work out each client's base username (None when a login is already
+        # linked) and secure temporary password up front in one pass
+        plans = [
+            (client, None if client.user else (slugify(client.name)[:20] or 'client'), get_random_string(12))
+            for client in clients
+        ]
 
-            # Generate a secure temporary password
-            temp_password = get_random_string(12)
+        # Check username collisions against a single query for every existing
+        # username with one of those prefixes
+        base_usernames = {base_username for _, base_username, _ in plans if base_username}
+        taken = set()
+        if base_usernames:
+            prefixes = Q()
+            for base_username in base_usernames:
+                prefixes |= Q(username__startswith=base_username)
+            taken = set(User.objects.filter(prefixes).values_list('username', flat=True))
 
+        new_users = []
+        updated_users = []
+        clients_to_link = []
+        credentials = []
+        for client, base_username, temp_password in plans:
             if client.user:
                 user = client.user
                 user.is_active = True
-                user.set_password(temp_password)
-                user.save()
-                updated += 1
+                user.password = make_password(temp_password, hasher=TemporaryPasswordHasher.algorithm)
+                updated_users.append(user)
             else:
-                user = User.objects.create_user(
+                # Find unique username
+                username = base_username
+                suffix = 1
+                while username in taken:
+                    suffix += 1
+                    username = f"{base_username}{suffix}"
+                taken.add(username)
+
+                # Temporary passwords use a cheaper PBKDF2 work factor and are
+                # upgraded to the default hasher on the client's first login
+                user = User(
                     username=username,
                     email=(client.email or ''),
-                    password=temp_password,
+                    password=make_password(temp_password, hasher=TemporaryPasswordHasher.algorithm),
                 )
+                new_users.append(user)
                 client.user = user
-                client.save(update_fields=['user'])
-                created += 1
+                clients_to_link.append(client)
+            credentials.append((client, user, temp_password))
+
+        User.objects.bulk_create(new_users)
+        User.objects.bulk_update(updated_users, ['password', 'is_active'])
+        Client.objects.bulk_update(clients_to_link, ['user'])
 
-            # Ensure profile exists and is client role
+        # Ensure every account has a client-role profile. Profiles of existing
+        # users were joined in with the queryset; bulk_create skips the
+        # post_save signal, so new users get theirs here.
+        missing_profiles = [UserProfile(user=user, role=UserProfile.ROLE_CLIENT) for user in new_users]
+        wrong_role = []
+        for user in updated_users:
             profile = getattr(user, 'profile', None)
             if profile is None:
-                from accounts.models import UserProfile
-                profile = UserProfile.objects.create(user=user, role=UserProfile.ROLE_CLIENT)
-            else:
-                try:
-                    from accounts.models import UserProfile
-                    if profile.role != UserProfile.ROLE_CLIENT:
-                        profile.role = UserProfile.ROLE_CLIENT
-                        profile.save(update_fields=['role'])
-                except Exception:
-                    pass
-
-            # Show credentials (advise password reset)
-            messages.info(
-                request,
-                f"Credentials for {client.name}: username='{user.username}', temporary password='{temp_password}'. "
-                "Ask the client to log in and change their password (or use 'Forgot password')."
-            )
+                missing_profiles.append(UserProfile(user=user, role=UserProfile.ROLE_CLIENT))
+            elif profile.role != UserProfile.ROLE_CLIENT:
+                profile.role = UserProfile.ROLE_CLIENT
+                wrong_role.append(profile)
+        UserProfile.objects.bulk_create(missing_profiles)
+        UserProfile.objects.bulk_update(wrong_role, ['role'])
+
+        # Show all credentials in a single message (advise password reset)
+        if credentials:
+            messages.info(request, format_html(
+                "{}<br>Ask the clients to log in and change their password (or use 'Forgot password').",
+                format_html_join(
+                    mark_safe('<br>'),
+                    "Credentials for {}: username='{}', temporary password='{}'.",
+                    ((client.name, user.username, temp_password) for client, user, temp_password in credentials),
+                ),
+            ))
 
+        created = len(new_users)
+        updated = len(updated_users)
         if created or updated:
             messages.success(request, f"Client login accounts processed: created {created}, reset {updated}.")
         else:
@@ -103,10 +207,15 @@ class ClientAdmin(admin.ModelAdmin):
 
 
 @admin.register(DrillShift)
-class DrillShiftAdmin(admin.ModelAdmin):
-    list_display = ('id', 'date', 'shift_type', 'client', 'rig', 'location', 'supervisor_name', 'status', 'client_status', 'is_locked', 'created_at')
+class DrillShiftAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
+    list_display = ('id', 'date', 'shift_type', 'client', 'rig', 'location', 'supervisor_name', 'status', 'client_status', 'last_decision', 'active_alert_count', 'is_locked', 'created_at')
     list_filter = ('status', 'client_status', 'shift_type', 'date', 'is_locked', 'client', 'standby_client', 'standby_constructor')
     search_fields = ('rig', 'location', 'created_by__username', 'supervisor_name', 'driller_name')
+    list_select_related = ('client',)
+    show_full_result_count = False
+    paginator = LargeTablePaginator
+    # Primary-key order lets LIMIT/OFFSET pages walk an index
+    ordering = ('-id',)
     readonly_fields = ('created_at', 'updated_at', 'submitted_to_client_at', 'client_approved_at')
     fieldsets = (
         ('Basic Information', {
@@ -138,42 +247,70 @@ class DrillShiftAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # Pre-join every FK shown on the change page and used by search/filters
+        return super().get_queryset(request).select_related('client', 'created_by', 'client_approved_by')
+
 
 @admin.register(DrillingProgress)
-class DrillingProgressAdmin(admin.ModelAdmin):
+class DrillingProgressAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     list_display = ('id', 'shift', 'hole_number', 'start_depth', 'end_depth', 'meters_drilled', 'recovery_percentage', 'penetration_rate')
+    list_select_related = ('shift',)
+    show_full_result_count = False
+    paginator = LargeTablePaginator
+    ordering = ('-id',)
     search_fields = ('shift__id', 'hole_number')
     readonly_fields = ('recovery_percentage', 'penetration_rate')
 
 
 @admin.register(ActivityLog)
-class ActivityLogAdmin(admin.ModelAdmin):
+class ActivityLogAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     list_display = ('id', 'shift', 'activity_type', 'duration_minutes', 'timestamp', 'performed_by')
+    list_select_related = ('shift', 'performed_by')
+    show_full_result_count = False
+    paginator = LargeTablePaginator
+    ordering = ('-id',)
     list_filter = ('activity_type',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('shift', 'performed_by')
+
 
 @admin.register(MaterialUsed)
-class MaterialUsedAdmin(admin.ModelAdmin):
+class MaterialUsedAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     list_display = ('id', 'shift', 'material_name', 'quantity', 'unit')
+    list_select_related = ('shift',)
+    show_full_result_count = False
+    ordering = ('-id',)
 
 
 @admin.register(Survey)
-class SurveyAdmin(admin.ModelAdmin):
+class SurveyAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     list_display = ('id', 'shift', 'survey_type', 'depth', 'dip_angle', 'azimuth', 'surveyor_name', 'survey_time')
+    list_select_related = ('shift',)
+    show_full_result_count = False
     list_filter = ('survey_type', 'survey_time')
     search_fields = ('shift__id', 'surveyor_name')
     ordering = ('-survey_time',)
 
 
 @admin.register(Casing)
-class CasingAdmin(admin.ModelAdmin):
+class CasingAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     list_display = ('id', 'shift', 'casing_size', 'casing_type', 'start_depth', 'end_depth', 'length', 'installed_at')
+    list_select_related = ('shift',)
+    show_full_result_count = False
     list_filter = ('casing_size', 'casing_type', 'installed_at')
     search_fields = ('shift__id',)
     ordering = ('-installed_at',)
 
 
 @admin.register(ApprovalHistory)
-class ApprovalHistoryAdmin(admin.ModelAdmin):
+class ApprovalHistoryAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     list_display = ('id', 'shift', 'approver', 'role', 'decision', 'timestamp')
+    list_select_related = ('shift', 'approver')
+    show_full_result_count = False
+    ordering = ('-id',)
     list_filter = ('decision',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('shift', 'approver')
@@ -29,6 +29,7 @@ class DrillingProgressForm(forms.ModelForm):
             'start_time': forms.TimeInput(attrs={'type': 'time'}),
             'end_time': forms.TimeInput(attrs={'type': 'time'}),
             'hole_number': forms.TextInput(attrs={'placeholder': 'e.g., BH-001'}),
+            'core_tray_image': forms.ClearableFileInput(attrs={'accept': 'image/*'}),
         }
 
 
@@ -65,34 +66,35 @@ class CasingForm(forms.ModelForm):
         }
 
 
-# Create formsets for inline editing
+# Create formsets for inline editing. No blank extra forms are rendered;
+# shift_form.html adds rows client-side from each formset's empty_form.
 DrillingProgressFormSet = inlineformset_factory(
     DrillShift, DrillingProgress,
     form=DrillingProgressForm,
-    extra=1, can_delete=True,
+    extra=0, can_delete=True,
     min_num=1, validate_min=True
 )
 
 ActivityLogFormSet = inlineformset_factory(
     DrillShift, ActivityLog,
     form=ActivityLogForm,
-    extra=1, can_delete=True
+    extra=0, can_delete=True
 )
 
 MaterialUsedFormSet = inlineformset_factory(
     DrillShift, MaterialUsed,
     form=MaterialUsedForm,
-    extra=1, can_delete=True
+    extra=0, can_delete=True
 )
 
 SurveyFormSet = inlineformset_factory(
     DrillShift, Survey,
     form=SurveyForm,
-    extra=1, can_delete=True
+    extra=0, can_delete=True
 )
 
 CasingFormSet = inlineformset_factory(
     DrillShift, Casing,
     form=CasingForm,
-    extra=1, can_delete=True
+    extra=0, can_delete=True
 )
@@ -0,0 +1,24 @@
+# Recalculate derived drilling progress fields in bulk
+# Useful after importing rows with raw SQL or changing the calculation rules
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.models import DrillingProgress
+
+class Command(BaseCommand):
+    help = 'Recalculates meters drilled and penetration rate for all drilling progress rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shift', type=int, help='Only recalculate progress for this shift id')
+
+    def handle(self, *args, **options):
+        progress = DrillingProgress.objects.all()
+        if options['shift']:
+            progress = progress.filter(shift_id=options['shift'])
+        
+        # Two set-based UPDATEs, committed together
+        with transaction.atomic():
+            meters_updated, rates_updated = progress.recalculate_kpis()
+        
+        self.stdout.write(self.style.SUCCESS(f'✓ Meters drilled filled in for {meters_updated} rows'))
+        self.stdout.write(self.style.SUCCESS(f'✓ Penetration rate recalculated for {rates_updated} rows'))
@@ -2,7 +2,8 @@
 # Deletes all shift reports but keeps users
 
 from django.core.management.base import BaseCommand
-from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed, Survey, Casing, ApprovalHistory
+from django.db import connection, transaction
+from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed, Survey, Casing, ApprovalHistory, Alert
 from django.contrib.auth.models import User
 from accounts.models import UserProfile
 
@@ -12,13 +13,21 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         # Count before deletion
         shift_count = DrillShift.objects.count()
-        progress_count = DrillingProgress.objects.count()
-        activity_count = ActivityLog.objects.count()
         
         self.stdout.write(f'Found {shift_count} shifts to delete...')
         
-        # Delete all report data (cascades will handle related records)
-        DrillShift.objects.all().delete()
+        if connection.vendor == 'postgresql':
+            # One TRUNCATE instead of loading every row to cascade in Python
+            tables = ', '.join(
+                connection.ops.quote_name(model._meta.db_table)
+                for model in (DrillShift, DrillingProgress, ActivityLog, MaterialUsed,
+                              Survey, Casing, ApprovalHistory, Alert)
+            )
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+        else:
+            # Delete all report data (cascades will handle related records)
+            DrillShift.objects.all().delete()
         
         # Verify deletion
         remaining_shifts = DrillShift.objects.count()
@@ -0,0 +1,23 @@
+# Pre-render PDFs of locked (client-approved) shifts into the cache
+# Run from cron or a worker after approvals so exports are served without rendering
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.models import DrillShift
+from core.pdf_utils import warm_shift_pdf_cache
+
+class Command(BaseCommand):
+    help = 'Renders and caches PDFs for locked shifts that are not cached yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Only consider shifts dated within this many days (0 for all)')
+
+    def handle(self, *args, **options):
+        shifts = DrillShift.objects.all()
+        if options['days']:
+            shifts = shifts.filter(date__gte=timezone.localdate() - timedelta(days=options['days']))
+        
+        rendered = warm_shift_pdf_cache(shifts)
+        
+        self.stdout.write(self.style.SUCCESS(f'✓ Rendered {rendered} shift PDFs into the cache'))
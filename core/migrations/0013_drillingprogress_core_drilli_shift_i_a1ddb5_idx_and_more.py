@@ -0,0 +1,35 @@
+# Generated by Django 5.0 on 2026-10-14 14:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_drillshift_manager_approved_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drillingprogress',
+            index=models.Index(fields=['shift', 'hole_number'], name='core_drilli_shift_i_a1ddb5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['client', '-date'], name='core_drills_client__ee65d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['status', '-date'], name='core_drills_status_73833f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['client_status'], name='core_drills_client__cd50a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['shift_type', '-date'], name='core_drills_shift_t_13066a_idx'),
+        ),
+    ]
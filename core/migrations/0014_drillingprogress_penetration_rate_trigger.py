@@ -0,0 +1,58 @@
+# Computes DrillingProgress.penetration_rate in the database on PostgreSQL so
+# rows written with bulk_create/bulk_update or raw SQL stay consistent with
+# DrillingProgress.save(). Other backends keep relying on save().
+
+from django.db import migrations
+
+
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION core_drillingprogress_penetration_rate() RETURNS trigger AS $$
+DECLARE
+    duration_hours numeric;
+BEGIN
+    IF NEW.start_time IS NOT NULL AND NEW.end_time IS NOT NULL
+       AND NEW.meters_drilled IS NOT NULL AND NEW.meters_drilled <> 0 THEN
+        duration_hours := EXTRACT(EPOCH FROM (NEW.end_time - NEW.start_time)) / 3600;
+        -- Handle times crossing midnight
+        IF duration_hours < 0 THEN
+            duration_hours := duration_hours + 24;
+        END IF;
+        IF duration_hours > 0 THEN
+            NEW.penetration_rate := round(NEW.meters_drilled / duration_hours, 2);
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS core_drillingprogress_penetration_rate ON core_drillingprogress;
+CREATE TRIGGER core_drillingprogress_penetration_rate
+    BEFORE INSERT OR UPDATE ON core_drillingprogress
+    FOR EACH ROW EXECUTE FUNCTION core_drillingprogress_penetration_rate();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS core_drillingprogress_penetration_rate ON core_drillingprogress;
+DROP FUNCTION IF EXISTS core_drillingprogress_penetration_rate();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER, params=None)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_drillingprogress_core_drilli_shift_i_a1ddb5_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-14 14:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_drillingprogress_penetration_rate_trigger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['client', '-id'], name='core_drills_client__f411a0_idx'),
+        ),
+    ]
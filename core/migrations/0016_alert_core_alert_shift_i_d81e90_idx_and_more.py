@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-14 14:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_drillshift_core_drills_client__f411a0_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['shift', 'is_active'], name='core_alert_shift_i_d81e90_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='approvalhistory',
+            index=models.Index(fields=['shift', '-timestamp'], name='core_approv_shift_i_49f2e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['created_by', 'status'], name='core_drills_created_292a2e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=models.Index(fields=['client', 'client_status'], name='core_drills_client__35d417_idx'),
+        ),
+    ]
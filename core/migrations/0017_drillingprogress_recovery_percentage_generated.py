@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-14 14:50
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_alert_core_alert_shift_i_d81e90_idx_and_more'),
+    ]
+
+    # A column can't be altered into a generated one, so drop and re-add it;
+    # the database recomputes the values for existing rows.
+    operations = [
+        migrations.RemoveField(
+            model_name='drillingprogress',
+            name='recovery_percentage',
+        ),
+        migrations.AddField(
+            model_name='drillingprogress',
+            name='recovery_percentage',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(meters_drilled__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('meters_drilled'), '-', models.F('core_loss')), '+', models.F('core_gain')), '*', models.Value(100)), '/', models.F('meters_drilled'))), default=None), help_text='Auto-calculated', output_field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+        ),
+    ]
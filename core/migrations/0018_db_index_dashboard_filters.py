@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-14 14:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_drillingprogress_recovery_percentage_generated'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='drillshift',
+            name='core_drills_status_047804_idx',
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='is_acknowledged',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='approvalhistory',
+            name='decision',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], db_index=True, default='pending', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='approvalhistory',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='casing',
+            name='installed_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='drillshift',
+            name='manager_approved_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Timestamp when manager approved shift', null=True),
+        ),
+        migrations.AlterField(
+            model_name='drillshift',
+            name='submitted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Timestamp when shift was first submitted', null=True),
+        ),
+        migrations.AlterField(
+            model_name='survey',
+            name='survey_time',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
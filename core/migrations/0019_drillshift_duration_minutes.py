@@ -0,0 +1,35 @@
+# Generated by Django 5.0 on 2026-10-14 14:54
+
+from django.db import migrations, models
+
+
+def backfill_duration_minutes(apps, schema_editor):
+    DrillShift = apps.get_model('core', 'DrillShift')
+    shifts = list(
+        DrillShift.objects.filter(start_time__isnull=False, end_time__isnull=False)
+        .only('id', 'start_time', 'end_time')
+    )
+    for shift in shifts:
+        start = shift.start_time.hour * 60 + shift.start_time.minute
+        end = shift.end_time.hour * 60 + shift.end_time.minute
+        # Handle night shift that crosses midnight
+        if end < start:
+            end += 24 * 60
+        shift.duration_minutes = end - start
+    DrillShift.objects.bulk_update(shifts, ['duration_minutes'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_db_index_dashboard_filters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drillshift',
+            name='duration_minutes',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Shift length in minutes (set on save)', null=True),
+        ),
+        migrations.RunPython(backfill_duration_minutes, migrations.RunPython.noop),
+    ]
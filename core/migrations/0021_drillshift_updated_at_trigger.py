@@ -0,0 +1,46 @@
+# Stamps DrillShift.updated_at in the database on PostgreSQL so
+# QuerySet.update() and save(update_fields=...) calls that leave the column
+# out still record the change. Other backends keep relying on auto_now.
+
+from django.db import migrations
+
+
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION core_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS core_drillshift_touch_updated_at ON core_drillshift;
+CREATE TRIGGER core_drillshift_touch_updated_at
+    BEFORE UPDATE ON core_drillshift
+    FOR EACH ROW EXECUTE FUNCTION core_touch_updated_at();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS core_drillshift_touch_updated_at ON core_drillshift;
+DROP FUNCTION IF EXISTS core_touch_updated_at();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER, params=None)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_db_side_timestamps'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
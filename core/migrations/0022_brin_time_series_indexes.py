@@ -0,0 +1,42 @@
+# Generated by Django 5.0 on 2026-10-14 14:58
+
+import core.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_drillshift_updated_at_trigger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='drillshift',
+            name='core_drills_date_1117ab_idx',
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AlterField(
+            model_name='approvalhistory',
+            name='timestamp',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=core.models.BrinIndex(fields=['created_at'], name='core_alert_created_660981_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='approvalhistory',
+            index=core.models.BrinIndex(fields=['timestamp'], name='core_approv_timesta_9bebb1_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='drillshift',
+            index=core.models.BrinIndex(fields=['date'], name='core_drills_date_b8ea81_brin', pages_per_range=32),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-14 15:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    DrillShift = apps.get_model('core', 'DrillShift')
+    Alert = apps.get_model('core', 'Alert')
+    ApprovalHistory = apps.get_model('core', 'ApprovalHistory')
+    active = (
+        Alert.objects.filter(shift_id=OuterRef('pk'), is_active=True)
+        .order_by().values('shift_id').annotate(total=Count('pk')).values('total')
+    )
+    latest = (
+        ApprovalHistory.objects.filter(shift_id=OuterRef('pk'))
+        .order_by('-timestamp', '-id').values('decision')[:1]
+    )
+    DrillShift.objects.update(
+        active_alert_count=Coalesce(Subquery(active), 0),
+        last_decision=Coalesce(Subquery(latest), Value('')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_brin_time_series_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drillshift',
+            name='active_alert_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='drillshift',
+            name='last_decision',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
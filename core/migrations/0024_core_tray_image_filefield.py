@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-14 15:01
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_drillshift_alert_and_decision_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='drillingprogress',
+            name='core_tray_image',
+            field=models.FileField(blank=True, help_text='Photo of core tray (optional)', null=True, upload_to='core_trays/%Y/%m/%d/', validators=[django.core.validators.FileExtensionValidator(['jpg', 'jpeg', 'png', 'gif', 'webp'])]),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-14 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_core_tray_image_filefield'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='drillingprogress',
+            constraint=models.CheckConstraint(check=models.Q(('end_depth__gte', models.F('start_depth'))), name='progress_depths_ordered'),
+        ),
+        migrations.AddConstraint(
+            model_name='drillingprogress',
+            constraint=models.CheckConstraint(check=models.Q(('meters_drilled__gte', 0)), name='progress_meters_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='drillingprogress',
+            constraint=models.CheckConstraint(check=models.Q(('core_loss__gte', 0), ('core_gain__gte', 0)), name='progress_core_loss_gain_nonneg'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-14 15:30
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_drillingprogress_check_constraints'),
+    ]
+
+    # The 0017 expression used integer division on SQLite for whole-number
+    # meters. Generated columns can't be altered, so drop and re-add it; the
+    # database recomputes the values for existing rows.
+    operations = [
+        migrations.RemoveField(
+            model_name='drillingprogress',
+            name='recovery_percentage',
+        ),
+        migrations.AddField(
+            model_name='drillingprogress',
+            name='recovery_percentage',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(meters_drilled__gt=0, then=models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('meters_drilled'), '-', models.F('core_loss')), '+', models.F('core_gain')), '*', models.Value(100.0)), '/', models.F('meters_drilled')), output_field=models.FloatField())), default=None), help_text='Auto-calculated', output_field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+        ),
+    ]
@@ -1,7 +1,29 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.conf import settings
+from django.contrib.postgres.indexes import BrinIndex as PostgresBrinIndex
+from django.core.validators import FileExtensionValidator
+from functools import cached_property
+from django.db.models import Avg, Case, Count, ExpressionWrapper, F, OuterRef, Prefetch, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, ExtractHour, ExtractMinute, ExtractSecond, Now, Round
 from django.utils import timezone
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+
+
+class BrinIndex(PostgresBrinIndex):
+    """
+    BRIN index on PostgreSQL, plain B-tree index on other backends.
+
+    BRIN suits append-mostly date/timestamp columns that are scanned by
+    range: it is a fraction of a B-tree's size. SQLite has no BRIN, so
+    development databases get an ordinary index instead.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return models.Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
 
 
 class Client(models.Model):
@@ -24,7 +46,7 @@ class Client(models.Model):
     phone = models.CharField(max_length=50, blank=True)
     address = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['name']
@@ -33,6 +55,74 @@ class Client(models.Model):
         return self.name
 
 
+# Number of activities listed on a shift's PDF report
+PDF_ACTIVITY_LIMIT = 10
+
+
+class DrillShiftQuerySet(models.QuerySet):
+    """QuerySet helpers for loading shifts together with their related rows."""
+
+    def with_related(self):
+        """
+        Join the shift's foreign keys and prefetch every reverse relation.
+
+        Rendering a shift touches the client, both users and all of its child
+        tables; loading them up front keeps that to a fixed number of queries
+        no matter how many shifts or rows are involved.
+        """
+        return self.select_related(
+            'client', 'created_by', 'client_approved_by',
+        ).prefetch_related(
+            Prefetch('progress', queryset=DrillingProgress.objects.order_by('start_depth')),
+            'activities',
+            'materials',
+            'surveys',
+            'casings',
+            Prefetch('alerts', queryset=Alert.objects.filter(is_active=True)),
+            Prefetch('approvals', queryset=ApprovalHistory.objects.select_related('approver')),
+        )
+
+    def for_pdf(self):
+        """
+        Load what ``core.pdf_utils.generate_shift_pdf`` renders, up front.
+
+        The report reads the client and every child section; this keeps it
+        to a fixed handful of queries however many rows the shift has. The
+        progress total is summed in the same query (see ``with_totals``).
+        Free-text columns the report never prints are deferred.
+        """
+        return self.select_related('client').defer(
+            'client_comments', 'client__address',
+        ).prefetch_related(
+            Prefetch('progress', queryset=DrillingProgress.objects.defer('remarks')),
+            # The report lists only the latest activities; limit them in SQL
+            Prefetch(
+                'activities',
+                queryset=ActivityLog.objects.all()[:PDF_ACTIVITY_LIMIT],
+                to_attr='pdf_activities',
+            ),
+            Prefetch('materials', queryset=MaterialUsed.objects.defer('remarks')),
+            Prefetch('surveys', queryset=Survey.objects.defer('findings')),
+            Prefetch('casings', queryset=Casing.objects.defer('remarks')),
+        ).with_totals()
+
+    def with_totals(self):
+        """
+        Annotate per-shift progress totals in the same query as the shifts.
+
+        Adds ``total_meters``, ``avg_recovery`` and ``avg_rop`` so list and
+        report pages don't aggregate once per shift.
+        """
+        return self.annotate(
+            total_meters=Coalesce(
+                Sum('progress__meters_drilled'), Decimal('0'),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2),
+            ),
+            avg_recovery=Avg('progress__recovery_percentage'),
+            avg_rop=Avg('progress__penetration_rate'),
+        )
+
+
 class DrillShift(models.Model):
     """
     Main model representing a drilling shift/report.
@@ -48,9 +138,12 @@ class DrillShift(models.Model):
         location: Location where drilling took place
         start_time: When the shift started
         end_time: When the shift ended
+        duration_minutes: Shift length in minutes, stored on save from the times
         notes: Additional notes or comments
         status: Current workflow status (draft/submitted/approved/rejected)
         is_locked: Whether the shift is locked for editing
+        active_alert_count: Number of active alerts (kept up to date by signals)
+        last_decision: Most recent approval decision (kept up to date by signals)
         created_at: Timestamp when the record was created
         updated_at: Timestamp when the record was last updated
     """
@@ -111,12 +204,13 @@ class DrillShift(models.Model):
     
     start_time = models.TimeField(null=True, blank=True)
     end_time = models.TimeField(null=True, blank=True)
+    duration_minutes = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Shift length in minutes (set on save)")
     notes = models.TextField(blank=True)
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_DRAFT)
 
     # Workflow timestamps
-    submitted_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp when shift was first submitted")
-    manager_approved_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp when manager approved shift")
+    submitted_at = models.DateTimeField(null=True, blank=True, db_index=True, help_text="Timestamp when shift was first submitted")
+    manager_approved_at = models.DateTimeField(null=True, blank=True, db_index=True, help_text="Timestamp when manager approved shift")
     
     # Standby tracking
     STANDBY_CLIENT_REASONS = [
@@ -153,42 +247,154 @@ class DrillShift(models.Model):
     client_approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='client_approvals')
     
     is_locked = models.BooleanField(default=False)
-    created_at = models.DateTimeField(default=timezone.now)
+
+    # Denormalized from Alert/ApprovalHistory for list views (see signals below)
+    active_alert_count = models.PositiveSmallIntegerField(default=0, editable=False)
+    last_decision = models.CharField(max_length=16, blank=True, default='', editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Also stamped by a BEFORE UPDATE trigger on PostgreSQL (migration 0021)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = DrillShiftQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date', '-id']
         indexes = [
-            models.Index(fields=['date']),
-            models.Index(fields=['status']),
+            # Date-range scans for reports; BRIN keeps it tiny on PostgreSQL
+            BrinIndex(fields=['date'], pages_per_range=32),
             models.Index(fields=['project_code']),
+            # Admin list_filter / dashboard filters, newest first
+            models.Index(fields=['client', '-date']),
+            # Also serves status-only filters, so there's no separate status index
+            models.Index(fields=['status', '-date']),
+            models.Index(fields=['client_status']),
+            models.Index(fields=['shift_type', '-date']),
+            models.Index(fields=['client', '-id']),
+            # Role-scoped list/report queries
+            models.Index(fields=['created_by', 'status']),
+            models.Index(fields=['client', 'client_status']),
         ]
 
     def __str__(self):
         return f"Shift {self.id} - {self.date} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        """Store the shift length so reports can filter and order by it."""
+        # Reading deferred times would lazy-load them one query each; they
+        # can't have changed on such an instance, so leave the length alone
+        if not {'start_time', 'end_time'} & self.get_deferred_fields():
+            seconds = self._duration_seconds()
+            self.duration_minutes = None if seconds is None else seconds // 60
+        self.__dict__.pop('shift_hours', None)
+        super().save(*args, **kwargs)
     
     def get_total_meters_drilled(self):
-        """Calculate total meters drilled from all progress entries."""
-        from django.db.models import Sum
-        total = self.progress.aggregate(total=Sum('meters_drilled'))['total']
-        return total or 0
-    
-    def get_shift_hours(self):
-        """Calculate total shift duration in hours."""
+        """
+        Calculate total meters drilled from all progress entries.
+
+        List views should load shifts with ``with_totals`` so this doesn't run
+        one query per shift; progress rows already prefetched (see
+        ``with_related``) are summed in Python.
+        """
+        if getattr(self, 'total_meters', None) is not None:
+            return self.total_meters or 0
+        if 'progress' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum((p.meters_drilled for p in self.progress.all()), Decimal('0')) or 0
+        # Not memoized: the rows can change on this instance, and the
+        # ``total_meters`` name belongs to the with_totals() annotation
+        return self.progress.aggregate(total=Sum('meters_drilled'))['total'] or 0
+    
+    def _duration_seconds(self):
+        """Seconds between start_time and end_time, or None if either is unset."""
         if self.start_time and self.end_time:
-            from datetime import datetime, timedelta
-            start = datetime.combine(self.date, self.start_time)
-            end = datetime.combine(self.date, self.end_time)
+            start = self.start_time.hour * 3600 + self.start_time.minute * 60 + self.start_time.second
+            end = self.end_time.hour * 3600 + self.end_time.minute * 60 + self.end_time.second
             
             # Handle night shift that crosses midnight
             if end < start:
-                end += timedelta(days=1)
+                end += 86400
             
-            duration = end - start
-            return duration.total_seconds() / 3600
+            return end - start
+        return None
+
+    @cached_property
+    def shift_hours(self):
+        """Total shift duration in hours (computed once per instance)."""
+        seconds = self._duration_seconds()
+        if seconds is not None:
+            return seconds / 3600
         return 12  # Default 12 hours for standard shift
 
 
+CORE_TRAY_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
+
+
+class DrillingProgressQuerySet(models.QuerySet):
+    """QuerySet helpers for writing DrillingProgress rows in bulk."""
+
+    def bulk_create_with_calc(self, rows, batch_size=1000):
+        """
+        Insert progress rows in batches, deriving their calculated fields first.
+
+        Imports should use this instead of calling ``save()`` per row, which
+        costs one INSERT per row.
+        """
+        for row in rows:
+            DrillingProgress.recompute(row)
+        return self.bulk_create(rows, batch_size=batch_size)
+
+    def bulk_update_with_calc(self, rows, fields, batch_size=1000):
+        """
+        Update progress rows in batches, re-deriving their calculated fields.
+
+        The derived columns are always written alongside ``fields``.
+        """
+        for row in rows:
+            DrillingProgress.recompute(row)
+        fields = list(dict.fromkeys([*fields, 'meters_drilled', 'penetration_rate']))
+        return self.bulk_update(rows, fields, batch_size=batch_size)
+
+    def recalculate_kpis(self):
+        """
+        Recompute the derived fields of every row in the queryset in SQL.
+
+        Mirrors ``DrillingProgress.recompute`` with two set-based UPDATEs
+        (meters drilled from the depths, then penetration rate from the
+        times) instead of loading and saving each row. recovery_percentage
+        is a generated column and never needs recalculating.
+
+        Returns:
+            Tuple of (meters rows updated, penetration rate rows updated)
+        """
+        meters_updated = self.filter(meters_drilled=0).update(
+            meters_drilled=F('end_depth') - F('start_depth')
+        )
+
+        def seconds(field):
+            return ExtractHour(field) * 3600 + ExtractMinute(field) * 60 + ExtractSecond(field)
+
+        elapsed = seconds('end_time') - seconds('start_time')
+        # Handle times crossing midnight
+        duration = Case(
+            When(end_time__lt=F('start_time'), then=elapsed + 86400),
+            default=elapsed,
+        )
+        # Float arithmetic keeps SQLite from doing integer division; Round
+        # casts back to numeric on PostgreSQL
+        rate = Round(
+            ExpressionWrapper(
+                F('meters_drilled') * Value(3600.0) / duration,
+                output_field=models.FloatField(),
+            ), 2,
+            output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        )
+        rates_updated = self.filter(
+            start_time__isnull=False, end_time__isnull=False, meters_drilled__gt=0,
+        ).exclude(start_time=F('end_time')).update(penetration_rate=rate)
+        return meters_updated, rates_updated
+
+
 class DrillingProgress(models.Model):
     """
     Records drilling progress measurements for a shift.
@@ -205,7 +411,7 @@ class DrillingProgress(models.Model):
         meters_drilled: Total meters drilled (calculated or entered)
         core_loss: Core loss in meters
         core_gain: Core gain in meters
-        recovery_percentage: Auto-calculated core recovery percentage
+        recovery_percentage: Core recovery percentage (generated column)
         penetration_rate: Drilling rate in meters per hour (auto-calculated)
         start_time: When drilling started for this segment
         end_time: When drilling ended for this segment
@@ -229,49 +435,91 @@ class DrillingProgress(models.Model):
     # Core recovery fields
     core_loss = models.DecimalField(max_digits=10, decimal_places=2, default=0, help_text="Core loss in meters")
     core_gain = models.DecimalField(max_digits=10, decimal_places=2, default=0, help_text="Core gain in meters")
-    recovery_percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, help_text="Auto-calculated")
+    # Computed and stored by the database on every write, including bulk ones
+    recovery_percentage = models.GeneratedField(
+        expression=Case(
+            When(
+                meters_drilled__gt=0,
+                # Float arithmetic keeps SQLite from doing integer division
+                # when the meters are whole numbers
+                then=ExpressionWrapper(
+                    (F('meters_drilled') - F('core_loss') + F('core_gain')) * Value(100.0) / F('meters_drilled'),
+                    output_field=models.FloatField(),
+                ),
+            ),
+            default=None,
+        ),
+        output_field=models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True),
+        db_persist=True,
+        help_text="Auto-calculated",
+    )
     
     penetration_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Auto-calculated (m/hr)")
     start_time = models.TimeField(null=True, blank=True)
     end_time = models.TimeField(null=True, blank=True)
     remarks = models.TextField(blank=True)
     
-    # Core tray image (optional)
-    core_tray_image = models.ImageField(upload_to='core_trays/%Y/%m/%d/', blank=True, null=True, help_text="Photo of core tray (optional)")
+    # Core tray image (optional). A FileField with an extension check: ImageField
+    # would open every upload with Pillow just to read its dimensions.
+    core_tray_image = models.FileField(
+        upload_to='core_trays/%Y/%m/%d/', blank=True, null=True,
+        validators=[FileExtensionValidator(CORE_TRAY_IMAGE_EXTENSIONS)],
+        help_text="Photo of core tray (optional)",
+    )
+
+    objects = DrillingProgressQuerySet.as_manager()
 
     class Meta:
         ordering = ['start_depth']
+        indexes = [
+            models.Index(fields=['shift', 'hole_number']),
+        ]
+        constraints = [
+            models.CheckConstraint(check=Q(end_depth__gte=F('start_depth')), name='progress_depths_ordered'),
+            models.CheckConstraint(check=Q(meters_drilled__gte=0), name='progress_meters_nonneg'),
+            models.CheckConstraint(check=Q(core_loss__gte=0) & Q(core_gain__gte=0), name='progress_core_loss_gain_nonneg'),
+        ]
 
-    def save(self, *args, **kwargs):
-        """Auto-calculate recovery percentage and penetration rate before saving."""
+    @staticmethod
+    def recompute(instance):
+        """
+        Fill in the derived meters_drilled and penetration_rate on an instance.
+
+        Called by ``save()`` and by the bulk manager methods, so rows written
+        with ``bulk_create_with_calc``/``bulk_update_with_calc`` get the same
+        values as rows saved one at a time.
+        """
         # Auto-calc meters_drilled if not provided but depths are available
-        try:
-            if (self.meters_drilled is None or Decimal(self.meters_drilled) == 0) and \
-               self.start_depth is not None and self.end_depth is not None:
-                self.meters_drilled = Decimal(self.end_depth) - Decimal(self.start_depth)
-        except Exception:
-            # If any conversion fails, skip and let validation handle it
-            pass
-        # Calculate recovery percentage
-        if self.meters_drilled and self.meters_drilled > 0:
-            recovered_core = float(self.meters_drilled) - float(self.core_loss) + float(self.core_gain)
-            self.recovery_percentage = (recovered_core / float(self.meters_drilled)) * 100
-        
-        # Calculate penetration rate
-        if self.start_time and self.end_time and self.meters_drilled:
-            from datetime import datetime, timedelta
-            start = datetime.combine(datetime.today(), self.start_time)
-            end = datetime.combine(datetime.today(), self.end_time)
+        # (depth ordering and non-negative meters are enforced by Meta.constraints)
+        if (instance.meters_drilled is None or Decimal(instance.meters_drilled) == 0) and \
+           instance.start_depth is not None and instance.end_depth is not None:
+            instance.meters_drilled = Decimal(instance.end_depth) - Decimal(instance.start_depth)
+        # Calculate penetration rate (mirrored by a BEFORE INSERT/UPDATE
+        # trigger on PostgreSQL, see migration 0014, for bulk writes)
+        if instance.start_time and instance.end_time and instance.meters_drilled:
+            start = instance.start_time.hour * 3600 + instance.start_time.minute * 60 + instance.start_time.second
+            end = instance.end_time.hour * 3600 + instance.end_time.minute * 60 + instance.end_time.second
             
             # Handle times crossing midnight
             if end < start:
-                end += timedelta(days=1)
+                end += 86400
             
-            duration_hours = (end - start).total_seconds() / 3600
-            if duration_hours > 0:
-                self.penetration_rate = float(self.meters_drilled) / duration_hours
-        
+            duration_seconds = end - start
+            if duration_seconds > 0:
+                rate = Decimal(instance.meters_drilled) * 3600 / duration_seconds
+                instance.penetration_rate = rate.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def save(self, *args, **kwargs):
+        """Auto-calculate meters drilled and penetration rate before saving.
+
+        recovery_percentage is a generated column, so it is dropped from the
+        instance after the write; the first read afterwards loads it with one
+        extra query. Code that saves many rows and doesn't read it back pays
+        nothing.
+        """
+        self.recompute(self)
         super().save(*args, **kwargs)
+        self.__dict__.pop('recovery_percentage', None)
 
     def __str__(self):
         hole_info = f"{self.hole_number} - " if self.hole_number else ""
@@ -302,7 +550,7 @@ class ActivityLog(models.Model):
     ]
 
     shift = models.ForeignKey(DrillShift, on_delete=models.CASCADE, related_name='activities')
-    timestamp = models.DateTimeField(default=timezone.now)
+    timestamp = models.DateTimeField(default=timezone.now, db_default=Now())
     activity_type = models.CharField(max_length=32, choices=ACTIVITY_CHOICES, default='other')
     description = models.TextField()
     duration_minutes = models.PositiveIntegerField(default=0, help_text="Duration in minutes (required)")
@@ -376,7 +624,7 @@ class Survey(models.Model):
     azimuth = models.DecimalField(max_digits=6, decimal_places=2, help_text="Azimuth in degrees (0-360)")
     findings = models.TextField(blank=True, help_text="Survey results and observations")
     surveyor_name = models.CharField(max_length=255, blank=True)
-    survey_time = models.DateTimeField(default=timezone.now)
+    survey_time = models.DateTimeField(default=timezone.now, db_default=Now(), db_index=True)
     
     class Meta:
         ordering = ['depth']
@@ -427,7 +675,7 @@ class Casing(models.Model):
     end_depth = models.DecimalField(max_digits=10, decimal_places=2, help_text="Ending depth in meters")
     length = models.DecimalField(max_digits=10, decimal_places=2, help_text="Total length in meters")
     remarks = models.TextField(blank=True, help_text="Notes about casing installation")
-    installed_at = models.DateTimeField(default=timezone.now)
+    installed_at = models.DateTimeField(default=timezone.now, db_default=Now(), db_index=True)
     
     class Meta:
         ordering = ['start_depth']
@@ -464,12 +712,16 @@ class ApprovalHistory(models.Model):
     shift = models.ForeignKey(DrillShift, on_delete=models.CASCADE, related_name='approvals')
     approver = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
     role = models.CharField(max_length=64, blank=True)
-    decision = models.CharField(max_length=16, choices=DECISION_CHOICES, default=DECISION_PENDING)
+    decision = models.CharField(max_length=16, choices=DECISION_CHOICES, default=DECISION_PENDING, db_index=True)
     comments = models.TextField(blank=True)
-    timestamp = models.DateTimeField(default=timezone.now)
+    timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['shift', '-timestamp']),
+            BrinIndex(fields=['timestamp']),
+        ]
 
     def __str__(self):
         return f"{self.shift_id} - {self.decision} by {self.approver_id} @ {self.timestamp:%Y-%m-%d %H:%M}"
@@ -531,16 +783,18 @@ class Alert(models.Model):
     value = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Alert value (%, hours, etc)")
     threshold = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Threshold breached")
     is_active = models.BooleanField(default=True)
-    is_acknowledged = models.BooleanField(default=False)
+    is_acknowledged = models.BooleanField(default=False, db_index=True)
     acknowledged_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='acknowledged_alerts')
     acknowledged_at = models.DateTimeField(null=True, blank=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['alert_type', 'is_active']),
             models.Index(fields=['severity', 'is_active']),
+            models.Index(fields=['shift', 'is_active']),
+            BrinIndex(fields=['created_at']),
         ]
     
     def __str__(self):
@@ -552,3 +806,49 @@ class Alert(models.Model):
         self.acknowledged_by = user
         self.acknowledged_at = timezone.now()
         self.save()
+
+
+@receiver([post_save, post_delete], sender=Alert)
+def refresh_shift_alert_count(sender, instance, raw=False, **kwargs):
+    """Recount the shift's active alerts whenever one of its alerts changes."""
+    if raw:
+        return
+    active = (
+        Alert.objects.filter(shift_id=OuterRef('pk'), is_active=True)
+        .order_by().values('shift_id').annotate(total=Count('pk')).values('total')
+    )
+    DrillShift.objects.filter(pk=instance.shift_id).update(
+        active_alert_count=Coalesce(Subquery(active), 0)
+    )
+    _refresh_cached_shift(sender, instance, 'active_alert_count')
+
+
+@receiver([post_save, post_delete], sender=ApprovalHistory)
+def refresh_shift_last_decision(sender, instance, raw=False, **kwargs):
+    """Copy the shift's most recent approval decision onto the shift."""
+    if raw:
+        return
+    latest = (
+        ApprovalHistory.objects.filter(shift_id=OuterRef('pk'))
+        .order_by('-timestamp', '-id').values('decision')[:1]
+    )
+    DrillShift.objects.filter(pk=instance.shift_id).update(
+        last_decision=Coalesce(Subquery(latest), Value(''))
+    )
+    _refresh_cached_shift(sender, instance, 'last_decision')
+
+
+def _refresh_cached_shift(sender, instance, field):
+    """
+    Reload a counter on the shift instance the child row was saved with.
+
+    Views typically create alerts/history for a shift they still hold and
+    save again afterwards; reloading the column keeps that save from writing
+    the stale value back.
+    """
+    if sender.shift.is_cached(instance):
+        try:
+            instance.shift.refresh_from_db(fields=[field])
+        except DrillShift.DoesNotExist:
+            # The shift itself is being deleted
+            pass
@@ -3,12 +3,55 @@ PDF generation utilities for shift reports.
 Uses ReportLab to create receipt-style PDFs similar to Pick n Pay/Shoprite receipts.
 """
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
 from reportlab.lib import colors
+from reportlab.lib.utils import simpleSplit
 from reportlab.platypus import Table, TableStyle
 from io import BytesIO
+from pathlib import Path
+from django.core.cache import cache
+
+from .models import PDF_ACTIVITY_LIMIT, ActivityLog, Casing, DrillShift, Survey
+
+
+# Page geometry (A4, portrait). Receipt style: narrow margins, monospace feel
+PAGE_WIDTH, PAGE_HEIGHT = A4
+LEFT_MARGIN = 30
+RIGHT_MARGIN = PAGE_WIDTH - 30
+
+# Load the metrics of the standard fonts the report uses at import time, so
+# the first report rendered by each worker doesn't pay for it
+for _font_name in ("Helvetica", "Helvetica-Bold", "Courier"):
+    pdfmetrics.getFont(_font_name)
+
+# Separator rules at 8pt Courier: as many characters as fit between the
+# margins, capped at 80
+_SEPARATOR_LENGTH = min(80, int((RIGHT_MARGIN - LEFT_MARGIN) / 5))
+_SEPARATORS = {char: char * _SEPARATOR_LENGTH for char in '-='}
+
+
+# Choice labels for the per-row sections, resolved once instead of through
+# get_FOO_display() on every row
+_ACTIVITY_TYPE_DISPLAY = dict(ActivityLog._meta.get_field('activity_type').flatchoices)
+_SURVEY_TYPE_DISPLAY = dict(Survey._meta.get_field('survey_type').flatchoices)
+_CASING_TYPE_DISPLAY = dict(Casing._meta.get_field('casing_type').flatchoices)
+
+
+@lru_cache(maxsize=256)
+def _strwidth(text, font_name, size):
+    """Width of ``text`` in points; centered labels repeat across reports."""
+    return pdfmetrics.stringWidth(text, font_name, size)
+
+
+@lru_cache(maxsize=256)
+def _wrap(text, font_name, size, max_width):
+    """Split ``text`` into lines no wider than ``max_width`` points."""
+    return tuple(simpleSplit(text, font_name, size, max_width))
 
 
 def generate_shift_pdf(shift):
@@ -16,44 +59,72 @@ def generate_shift_pdf(shift):
     Generate a receipt-style PDF for a shift report.
     
     Args:
-        shift: DrillShift object with all related data
+        shift: DrillShift object with all related data, ideally loaded with
+            ``DrillShift.objects.for_pdf()`` so each section reads from the
+            prefetch cache
         
     Returns:
         BytesIO buffer containing the PDF
     """
-    buffer = BytesIO()
+    return BytesIO(generate_shift_pdf_bytes(shift))
+
+
+def generate_shift_pdf_bytes(shift):
+    """
+    Same as ``generate_shift_pdf`` but returns the raw PDF bytes.
     
-    # Create PDF (A4 size, portrait)
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
+    ReportLab assembles the whole document in memory anyway, so the bytes
+    are taken straight from the canvas instead of being written into a
+    file-like buffer and read back out.
+    """
+    # Evaluate each relation once; sections below reuse these lists
+    progress_rows = list(shift.progress.all())
+    activities = getattr(shift, 'pdf_activities', None)
+    if activities is None:
+        activities = list(shift.activities.all()[:PDF_ACTIVITY_LIMIT])
+    materials = list(shift.materials.all())
+    surveys = list(shift.surveys.all())
+    casings = list(shift.casings.all())
     
-    # Receipt style: narrow margins, monospace feel
-    left_margin = 30
-    right_margin = width - 30
+    # Create PDF (A4 size, portrait); nothing is written to the filename
+    c = canvas.Canvas(None, pagesize=A4)
+    width, height = PAGE_WIDTH, PAGE_HEIGHT
+    left_margin = LEFT_MARGIN
+    right_margin = RIGHT_MARGIN
     y = height - 40  # Start from top
     
+    # All text goes into one text object (a single BT/ET block); the font
+    # operator is only emitted when the font actually changes
+    page_text = c.beginText()
+    current_font = None
+    
+    def set_font(name, size):
+        nonlocal current_font
+        if current_font != (name, size):
+            page_text.setFont(name, size)
+            current_font = (name, size)
+    
     # Helper function to draw text lines
     def draw_line(text, size=10, bold=False, center=False):
         nonlocal y
-        if bold:
-            c.setFont("Helvetica-Bold", size)
-        else:
-            c.setFont("Helvetica", size)
+        font_name = "Helvetica-Bold" if bold else "Helvetica"
+        set_font(font_name, size)
         
         if center:
-            text_width = c.stringWidth(text, c._fontname, size)
+            text_width = _strwidth(text, font_name, size)
             x = (width - text_width) / 2
         else:
             x = left_margin
         
-        c.drawString(x, y, text)
+        page_text.setTextOrigin(x, y)
+        page_text.textOut(text)
         y -= size + 4
     
     def draw_separator(char="-"):
         nonlocal y
-        c.setFont("Courier", 8)
-        line = char * 80
-        c.drawString(left_margin, y, line[:int((right_margin - left_margin) / 5)])
+        set_font("Courier", 8)
+        page_text.setTextOrigin(left_margin, y)
+        page_text.textOut(_SEPARATORS[char])
         y -= 10
     
     # ======= HEADER =======
@@ -91,27 +162,21 @@ def generate_shift_pdf(shift):
     draw_line("DRILLING PROGRESS", size=10, bold=True)
     y -= 5
     
-    progress_data = []
-    total_meters = 0
-    
-    for prog in shift.progress.all():
-        progress_data.append([
-            prog.hole_number or "--",
-            f"{prog.start_depth}m",
-            f"{prog.end_depth}m",
-            f"{prog.meters_drilled}m",
-        ])
-        total_meters += float(prog.meters_drilled or 0)
+    # Summed in SQL when loaded via for_pdf(); otherwise from the rows
+    # already evaluated above rather than with another query
+    total_meters = getattr(shift, 'total_meters', None)
+    if total_meters is None:
+        total_meters = sum((prog.meters_drilled or 0 for prog in progress_rows), Decimal('0'))
     
-    if progress_data:
-        c.setFont("Helvetica", 8)
+    if progress_rows:
         # Column headers
         draw_line("Hole    From    To      Meters", size=9)
         draw_separator("-")
         y -= 2
         
-        for row in progress_data:
-            line = f"{row[0]:<8}{row[1]:<8}{row[2]:<8}{row[3]}"
+        for prog in progress_rows:
+            hole = prog.hole_number or "--"
+            line = f"{hole:<8}{f'{prog.start_depth}m':<8}{f'{prog.end_depth}m':<8}{prog.meters_drilled}m"
             draw_line(line, size=8)
         
         draw_separator("-")
@@ -122,13 +187,13 @@ def generate_shift_pdf(shift):
     draw_separator()
     
     # ======= ACTIVITIES =======
-    if shift.activities.exists():
+    if activities:
         draw_line("ACTIVITIES & EVENTS", size=10, bold=True)
         y -= 5
         
-        for activity in shift.activities.all()[:10]:  # Limit to 10 activities
+        for activity in activities:
             time_str = activity.timestamp.strftime('%H:%M') if activity.timestamp else '--:--'
-            activity_line = f"{time_str} {activity.get_activity_type_display()}"
+            activity_line = f"{time_str} {_ACTIVITY_TYPE_DISPLAY.get(activity.activity_type, activity.activity_type)}"
             draw_line(activity_line, size=8)
             if activity.description and len(activity.description) < 60:
                 draw_line(f"  {activity.description[:60]}", size=7)
@@ -137,23 +202,23 @@ def generate_shift_pdf(shift):
         draw_separator()
     
     # ======= MATERIALS =======
-    if shift.materials.exists():
+    if materials:
         draw_line("MATERIALS USED", size=10, bold=True)
         y -= 5
         
-        for material in shift.materials.all():
+        for material in materials:
             mat_line = f"{material.material_name}: {material.quantity} {material.unit}"
             draw_line(mat_line, size=8)
         
         draw_separator()
     
     # ======= SURVEYS =======
-    if shift.surveys.exists():
+    if surveys:
         draw_line("SURVEYS", size=10, bold=True)
         y -= 5
         
-        for survey in shift.surveys.all():
-            survey_line = f"{survey.depth}m - {survey.get_survey_type_display()}"
+        for survey in surveys:
+            survey_line = f"{survey.depth}m - {_SURVEY_TYPE_DISPLAY.get(survey.survey_type, survey.survey_type)}"
             draw_line(survey_line, size=8)
             survey_detail = f"  Dip: {survey.dip_angle}° | Az: {survey.azimuth}°"
             draw_line(survey_detail, size=7)
@@ -162,12 +227,12 @@ def generate_shift_pdf(shift):
         draw_separator()
     
     # ======= CASING =======
-    if shift.casings.exists():
+    if casings:
         draw_line("CASING INSTALLED", size=10, bold=True)
         y -= 5
         
-        for casing in shift.casings.all():
-            casing_line = f"{casing.casing_size} {casing.get_casing_type_display()}: {casing.start_depth}m to {casing.end_depth}m"
+        for casing in casings:
+            casing_line = f"{casing.casing_size} {_CASING_TYPE_DISPLAY.get(casing.casing_type, casing.casing_type)}: {casing.start_depth}m to {casing.end_depth}m"
             draw_line(casing_line, size=8)
         
         draw_separator()
@@ -195,11 +260,15 @@ def generate_shift_pdf(shift):
     if shift.notes:
         draw_line("COMMENTS", size=10, bold=True)
         y -= 5
-        # Wrap long notes
-        notes_lines = shift.notes[:200].split('\n')  # Limit to 200 chars
+        # Wrap long notes to the page width
+        notes_lines = [
+            wrapped
+            for line in shift.notes[:200].split('\n')  # Limit to 200 chars
+            if line.strip()
+            for wrapped in _wrap(line.strip(), "Helvetica", 8, right_margin - left_margin)
+        ]
         for line in notes_lines[:5]:  # Max 5 lines
-            if line.strip():
-                draw_line(line.strip()[:70], size=8)
+            draw_line(line, size=8)
         
         draw_separator()
     
@@ -211,8 +280,112 @@ def generate_shift_pdf(shift):
     draw_separator("=")
     
     # Finalize PDF
+    c.drawText(page_text)
     c.showPage()
-    c.save()
+    return c.getpdfdata()
+
+
+def shift_pdf_filename(shift) -> str:
+    """Download/file name for a shift's PDF report."""
+    return f"Shift_Report_{shift.date.strftime('%Y%m%d')}_{shift.rig.replace(' ', '_')}_{shift.get_shift_type_display()}.pdf"
+
+
+def _iter_shift_pdf_bytes(shift_ids):
+    """Yield ``(shift, pdf_bytes)`` for the shifts, loaded with one ``for_pdf()`` pass."""
+    shifts = DrillShift.objects.for_pdf().filter(pk__in=list(shift_ids)).order_by('pk')
+    for shift in shifts:
+        yield shift, generate_shift_pdf_bytes(shift)
+
+
+def generate_shift_pdfs(shift_ids, output_dir=None):
+    """
+    Generate PDFs for many shifts from a single ``for_pdf()`` load.
+    
+    The related rows for every shift are fetched in one prefetch pass
+    instead of once per shift, which is what reporting jobs covering a whole
+    day of shifts need.
+    
+    Args:
+        shift_ids: Iterable of DrillShift primary keys
+        output_dir: Optional directory; when given, each PDF is written there
+            under ``shift_pdf_filename()``
+        
+    Returns:
+        Dict mapping shift pk to its BytesIO buffer, or to the written Path
+        when ``output_dir`` is given
+    """
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
     
-    buffer.seek(0)
-    return buffer
+    results = {}
+    for shift, pdf_bytes in _iter_shift_pdf_bytes(shift_ids):
+        if output_dir is None:
+            results[shift.pk] = BytesIO(pdf_bytes)
+        else:
+            path = output_dir / shift_pdf_filename(shift)
+            path.write_bytes(pdf_bytes)
+            results[shift.pk] = path
+    return results
+
+
+def shift_pdf_cache_key(shift) -> str:
+    """Cache key for a shift's rendered PDF; any save changes ``updated_at``."""
+    return f'shift_pdf:{shift.pk}:{shift.updated_at.timestamp()}'
+
+
+def render_shift_pdf(shift):
+    """
+    Return the PDF for a shift, reusing the stored render for locked shifts.
+    
+    A locked shift can no longer be edited, so its PDF is cached without a
+    timeout. Editable shifts are always rendered fresh. On a miss the shift
+    is reloaded with ``DrillShift.objects.for_pdf()``, so callers only need
+    the row itself.
+    
+    Args:
+        shift: DrillShift object
+        
+    Returns:
+        BytesIO buffer containing the PDF
+    """
+    key = shift_pdf_cache_key(shift) if shift.is_locked else None
+    if key is not None:
+        pdf_bytes = cache.get(key)
+        if pdf_bytes is not None:
+            return BytesIO(pdf_bytes)
+    
+    pdf_bytes = generate_shift_pdf_bytes(DrillShift.objects.for_pdf().get(pk=shift.pk))
+    if key is not None:
+        cache.set(key, pdf_bytes, None)
+    return BytesIO(pdf_bytes)
+
+
+def warm_shift_pdf_cache(shifts):
+    """
+    Render and cache the PDFs of locked shifts that are not cached yet.
+    
+    Meant to run outside the request cycle (see the ``warm_shift_pdfs``
+    management command), so downloads of approved reports never wait on
+    ReportLab.
+    
+    Args:
+        shifts: DrillShift queryset to consider; unlocked shifts are skipped
+        
+    Returns:
+        Number of PDFs rendered
+    """
+    keys = {
+        shift_pdf_cache_key(shift): shift.pk
+        for shift in shifts.filter(is_locked=True).only('pk', 'updated_at', 'is_locked')
+    }
+    # One round trip for all keys, not one per shift
+    cached = cache.get_many(list(keys))
+    missing = {pk: key for key, pk in keys.items() if key not in cached}
+    if not missing:
+        return 0
+    
+    pdfs = {missing[shift.pk]: pdf_bytes for shift, pdf_bytes in _iter_shift_pdf_bytes(missing)}
+    cache.set_many(pdfs, None)
+    return len(pdfs)
+
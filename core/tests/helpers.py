@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def create_user(username, role, password='test123'):
+    """Create a user and give the profile made by the post_save signal ``role``."""
+    user = User(username=username)
+    user.set_password(password)
+    user.save()
+    user.profile.role = role
+    user.profile.save(update_fields=['role'])
+    return user
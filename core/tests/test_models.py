@@ -1,10 +1,14 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from datetime import date
+from datetime import date, time
 from decimal import Decimal
-from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed, ApprovalHistory
+from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed, ApprovalHistory, Alert
 from accounts.models import UserProfile
+from core.tests.helpers import create_user
 
 User = get_user_model()
 
@@ -12,13 +16,9 @@ class DrillShiftModelTest(TestCase):
     @classmethod
     def setUpTestData(cls):
         # Create users with different roles
-        cls.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        cls.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        cls.supervisor.profile.save()
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
         
-        cls.manager = User.objects.create_user(username='manager', password='test123')
-        cls.manager.profile.role = UserProfile.ROLE_MANAGER
-        cls.manager.profile.save()
+        cls.manager = create_user('manager', UserProfile.ROLE_MANAGER)
 
     def test_create_drill_shift(self):
         """Test creating a basic drill shift"""
@@ -99,4 +99,219 @@ class DrillShiftModelTest(TestCase):
         shift.delete()
         self.assertEqual(DrillingProgress.objects.count(), 0)
         self.assertEqual(ActivityLog.objects.count(), 0)
-        self.assertEqual(MaterialUsed.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(MaterialUsed.objects.count(), 0)
+
+    def test_progress_rejects_reversed_depths(self):
+        """Test the database rejects progress ending above its start depth"""
+        shift = DrillShift.objects.create(
+            created_by=self.supervisor,
+            date=date.today(),
+            rig='Test Rig 1',
+            status=DrillShift.STATUS_DRAFT
+        )
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DrillingProgress.objects.create(
+                shift=shift,
+                start_depth=Decimal('15.50'),
+                end_depth=Decimal('10.00'),
+                meters_drilled=Decimal('5.50')
+            )
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DrillingProgress.objects.bulk_create([
+                DrillingProgress(
+                    shift=shift,
+                    start_depth=Decimal('10.00'),
+                    end_depth=Decimal('15.50'),
+                    meters_drilled=Decimal('-5.50')
+                )
+            ])
+        self.assertEqual(DrillingProgress.objects.count(), 0)
+
+    def create_alert(self, shift, **kwargs):
+        return Alert.objects.create(
+            shift=shift,
+            alert_type=Alert.ALERT_DOWNTIME,
+            title='Excessive Downtime',
+            description='Test alert',
+            **kwargs
+        )
+
+    def test_alert_signals_maintain_active_alert_count(self):
+        """Test active_alert_count follows alert creates, updates and deletes"""
+        shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today())
+        first = self.create_alert(shift)
+        self.create_alert(shift)
+        self.create_alert(shift, is_active=False)
+        self.assertEqual(DrillShift.objects.get(pk=shift.pk).active_alert_count, 2)
+        
+        first.is_active = False
+        first.save()
+        self.assertEqual(DrillShift.objects.get(pk=shift.pk).active_alert_count, 1)
+        
+        Alert.objects.filter(pk=first.pk).delete()
+        shift.alerts.filter(is_active=True).get().delete()
+        self.assertEqual(DrillShift.objects.get(pk=shift.pk).active_alert_count, 0)
+
+    def test_approval_signals_maintain_last_decision(self):
+        """Test last_decision is the most recent approval history decision"""
+        shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today())
+        ApprovalHistory.objects.create(shift=shift, decision=ApprovalHistory.DECISION_PENDING)
+        latest = ApprovalHistory.objects.create(shift=shift, approver=self.manager, decision=ApprovalHistory.DECISION_REJECTED)
+        self.assertEqual(DrillShift.objects.get(pk=shift.pk).last_decision, ApprovalHistory.DECISION_REJECTED)
+        
+        latest.delete()
+        self.assertEqual(DrillShift.objects.get(pk=shift.pk).last_decision, ApprovalHistory.DECISION_PENDING)
+
+    def test_saving_held_shift_keeps_counters(self):
+        """Test saving the instance an alert/decision was created with keeps the counters"""
+        shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today())
+        self.create_alert(shift)
+        ApprovalHistory.objects.create(shift=shift, approver=self.manager, decision=ApprovalHistory.DECISION_APPROVED)
+        self.assertEqual(shift.active_alert_count, 1)
+        
+        shift.notes = 'Edited after approval'
+        shift.save()
+        shift = DrillShift.objects.get(pk=shift.pk)
+        self.assertEqual(shift.active_alert_count, 1)
+        self.assertEqual(shift.last_decision, ApprovalHistory.DECISION_APPROVED)
+
+    def test_save_deferred_shift_single_query(self):
+        """Test saving a shift loaded with only() writes just the loaded fields"""
+        shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today(), rig='Rig 1')
+        shift = DrillShift.objects.only('id', 'notes').get(pk=shift.pk)
+        shift.notes = 'Updated'
+        with self.assertNumQueries(1):
+            shift.save()
+        shift = DrillShift.objects.get(pk=shift.pk)
+        self.assertEqual(shift.notes, 'Updated')
+        self.assertEqual(shift.rig, 'Rig 1')
+
+    def test_total_meters_drilled_reflects_new_progress(self):
+        """Test the unannotated total is not cached across progress changes"""
+        shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today())
+        self.assertEqual(shift.get_total_meters_drilled(), 0)
+        DrillingProgress.objects.create(
+            shift=shift,
+            start_depth=Decimal('10.00'),
+            end_depth=Decimal('15.50'),
+            meters_drilled=Decimal('5.50')
+        )
+        self.assertEqual(shift.get_total_meters_drilled(), Decimal('5.50'))
+        self.assertFalse(hasattr(shift, 'total_meters'))
+        
+        annotated = DrillShift.objects.with_totals().get(pk=shift.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(annotated.get_total_meters_drilled(), Decimal('5.50'))
+
+    def test_recovery_percentage_not_truncated(self):
+        """Test whole-number meters still give a fractional recovery percentage"""
+        shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today())
+        progress = DrillingProgress.objects.create(
+            shift=shift,
+            start_depth=Decimal('0'),
+            end_depth=Decimal('3'),
+            meters_drilled=Decimal('3'),
+            core_loss=Decimal('1')
+        )
+        gain = DrillingProgress.objects.create(
+            shift=shift,
+            start_depth=Decimal('3'),
+            end_depth=Decimal('9'),
+            meters_drilled=Decimal('6'),
+            core_gain=Decimal('0.1')
+        )
+        # Dropped after save and loaded from the database on first read
+        with self.assertNumQueries(1):
+            self.assertEqual(progress.recovery_percentage, Decimal('66.67'))
+        self.assertEqual(gain.recovery_percentage, Decimal('101.67'))
+        self.assertIsNone(DrillingProgress.objects.create(
+            shift=shift, start_depth=Decimal('9'), end_depth=Decimal('9'), meters_drilled=Decimal('0')
+        ).recovery_percentage)
+
+
+class DrillingProgressRecalculateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
+        cls.shift = DrillShift.objects.create(created_by=cls.supervisor, date=date.today())
+
+    def insert(self, shift=None, **kwargs):
+        """Insert a row without save(), so no derived field is filled in."""
+        values = {'start_depth': Decimal('10.00'), 'end_depth': Decimal('17.00'), 'meters_drilled': Decimal('0')}
+        values.update(kwargs)
+        return DrillingProgress.objects.bulk_create([DrillingProgress(shift=shift or self.shift, **values)])[0]
+
+    def test_meters_filled_from_depths(self):
+        """Test rows with no meters drilled get end_depth - start_depth"""
+        empty = self.insert()
+        entered = self.insert(meters_drilled=Decimal('5.00'))
+        self.assertEqual(DrillingProgress.objects.all().recalculate_kpis(), (1, 0))
+        self.assertEqual(DrillingProgress.objects.get(pk=empty.pk).meters_drilled, Decimal('7.00'))
+        self.assertEqual(DrillingProgress.objects.get(pk=entered.pk).meters_drilled, Decimal('5.00'))
+
+    def test_rate_handles_midnight_and_null_times(self):
+        """Test times crossing midnight add a day and rows missing a time are left alone"""
+        overnight = self.insert(meters_drilled=Decimal('4.00'), start_time=time(23, 0), end_time=time(1, 0))
+        no_end = self.insert(meters_drilled=Decimal('4.00'), start_time=time(8, 0), penetration_rate=Decimal('9.99'))
+        no_times = self.insert(meters_drilled=Decimal('4.00'))
+        self.assertEqual(DrillingProgress.objects.all().recalculate_kpis(), (0, 1))
+        self.assertEqual(DrillingProgress.objects.get(pk=overnight.pk).penetration_rate, Decimal('2.00'))
+        self.assertEqual(DrillingProgress.objects.get(pk=no_end.pk).penetration_rate, Decimal('9.99'))
+        self.assertIsNone(DrillingProgress.objects.get(pk=no_times.pk).penetration_rate)
+
+    def test_matches_recompute(self):
+        """Test the SQL results equal DrillingProgress.recompute() on the same rows"""
+        rows = [
+            self.insert(start_time=time(7, 0), end_time=time(8, 23, 17)),
+            self.insert(meters_drilled=Decimal('3.33'), start_time=time(19, 45), end_time=time(6, 10, 5)),
+            self.insert(meters_drilled=Decimal('12.50'), start_time=time(9, 0), end_time=time(9, 0, 1)),
+        ]
+        DrillingProgress.objects.all().recalculate_kpis()
+        for row in rows:
+            DrillingProgress.recompute(row)
+            stored = DrillingProgress.objects.get(pk=row.pk)
+            self.assertEqual(stored.meters_drilled, row.meters_drilled)
+            self.assertEqual(stored.penetration_rate, row.penetration_rate)
+
+    def test_command_shift_filter(self):
+        """Test --shift only recalculates that shift's rows"""
+        other_shift = DrillShift.objects.create(created_by=self.supervisor, date=date.today())
+        mine = self.insert()
+        other = self.insert(shift=other_shift)
+        out = StringIO()
+        call_command('recalculate_kpis', shift=self.shift.pk, stdout=out)
+        self.assertIn('Meters drilled filled in for 1 rows', out.getvalue())
+        self.assertEqual(DrillingProgress.objects.get(pk=mine.pk).meters_drilled, Decimal('7.00'))
+        self.assertEqual(DrillingProgress.objects.get(pk=other.pk).meters_drilled, Decimal('0.00'))
+        
+        call_command('recalculate_kpis', stdout=StringIO())
+        self.assertEqual(DrillingProgress.objects.get(pk=other.pk).meters_drilled, Decimal('7.00'))
+
+    def test_bulk_create_with_calc_sets_derived_fields(self):
+        """Test bulk_create_with_calc writes meters drilled and penetration rate"""
+        rows = [
+            DrillingProgress(shift=self.shift, start_depth=Decimal('10.00'), end_depth=Decimal('14.00'),
+                             meters_drilled=Decimal('0'), start_time=time(7, 0), end_time=time(9, 0)),
+            DrillingProgress(shift=self.shift, start_depth=Decimal('14.00'), end_depth=Decimal('20.00'),
+                             meters_drilled=Decimal('3.00'), start_time=time(23, 0), end_time=time(1, 0)),
+        ]
+        with self.assertNumQueries(1):
+            created = DrillingProgress.objects.bulk_create_with_calc(rows)
+        stored = {p.pk: p for p in DrillingProgress.objects.all()}
+        self.assertEqual(stored[created[0].pk].meters_drilled, Decimal('4.00'))
+        self.assertEqual(stored[created[0].pk].penetration_rate, Decimal('2.00'))
+        self.assertEqual(stored[created[1].pk].meters_drilled, Decimal('3.00'))
+        self.assertEqual(stored[created[1].pk].penetration_rate, Decimal('1.50'))
+
+    def test_bulk_update_with_calc_writes_derived_fields(self):
+        """Test bulk_update_with_calc re-derives and writes fields it wasn't given"""
+        row = self.insert(meters_drilled=Decimal('7.00'), start_time=time(7, 0), end_time=time(8, 0))
+        row.meters_drilled = Decimal('0')
+        row.end_depth = Decimal('20.00')
+        row.end_time = time(9, 0)
+        DrillingProgress.objects.bulk_update_with_calc([row], ['end_depth', 'end_time'])
+        stored = DrillingProgress.objects.get(pk=row.pk)
+        self.assertEqual(stored.meters_drilled, Decimal('10.00'))
+        self.assertEqual(stored.penetration_rate, Decimal('5.00'))
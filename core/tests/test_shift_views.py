@@ -5,27 +5,23 @@ from datetime import date
 from decimal import Decimal
 from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed
 from accounts.models import UserProfile
+from core.tests.helpers import create_user
 
 User = get_user_model()
 
 class ShiftDetailViewTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Create users with different roles
-        self.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        self.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.supervisor.profile.save()
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
         
-        self.manager = User.objects.create_user(username='manager', password='test123')
-        self.manager.profile.role = UserProfile.ROLE_MANAGER
-        self.manager.profile.save()
+        cls.manager = create_user('manager', UserProfile.ROLE_MANAGER)
         
-        self.client_user = User.objects.create_user(username='client', password='test123')
-        self.client_user.profile.role = UserProfile.ROLE_CLIENT
-        self.client_user.profile.save()
+        cls.client_user = create_user('client', UserProfile.ROLE_CLIENT)
         
         # Create test shift with related data
-        self.shift = DrillShift.objects.create(
-            created_by=self.supervisor,
+        cls.shift = DrillShift.objects.create(
+            created_by=cls.supervisor,
             date=date.today(),
             rig='Test Rig',
             location='Test Location',
@@ -33,25 +29,25 @@ class ShiftDetailViewTest(TestCase):
         )
         
         # Add progress data
-        self.progress = DrillingProgress.objects.create(
-            shift=self.shift,
+        cls.progress = DrillingProgress.objects.create(
+            shift=cls.shift,
             start_depth=Decimal('100.00'),
             end_depth=Decimal('150.00'),
             meters_drilled=Decimal('50.00')
         )
         
         # Add activity log
-        self.activity = ActivityLog.objects.create(
-            shift=self.shift,
+        cls.activity = ActivityLog.objects.create(
+            shift=cls.shift,
             activity_type='drilling',
             description='Test drilling',
             duration_minutes=120,
-            performed_by=self.supervisor
+            performed_by=cls.supervisor
         )
         
         # Add material usage
-        self.material = MaterialUsed.objects.create(
-            shift=self.shift,
+        cls.material = MaterialUsed.objects.create(
+            shift=cls.shift,
             material_name='Diesel',
             quantity=Decimal('100.00'),
             unit='liters'
@@ -94,6 +90,29 @@ class ShiftDetailViewTest(TestCase):
         self.assertTrue(response.context['can_submit'])
         self.assertFalse(response.context['can_approve'])
 
+    def test_detail_view_query_count_is_fixed(self):
+        # Related rows come from prefetches, not per-row queries in the view or template
+        ActivityLog.objects.create(
+            shift=self.shift,
+            activity_type='drilling',
+            description='More drilling',
+            duration_minutes=60,
+            performed_by=self.supervisor
+        )
+        DrillShift.objects.create(
+            created_by=self.supervisor,
+            date=self.shift.date,
+            rig=self.shift.rig,
+            location='Test Location',
+            shift_type='night',
+            status=DrillShift.STATUS_DRAFT
+        )
+        self.client.login(username='supervisor', password='test123')
+        # User, shift, seven prefetched relations and the companion shift
+        with self.assertNumQueries(10):
+            response = self.client.get(reverse('core:shift_detail', args=[self.shift.pk]))
+        self.assertEqual(response.context['total_activity_hours'], 3.0)
+
     def test_all_users_can_view_approved_shift(self):
         # Change shift status to approved
         self.shift.status = DrillShift.STATUS_APPROVED
@@ -111,19 +130,16 @@ class ShiftDetailViewTest(TestCase):
 
 
 class ShiftUpdateViewTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Create users
-        self.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        self.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.supervisor.profile.save()
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
         
-        self.other_supervisor = User.objects.create_user(username='other_sup', password='test123')
-        self.other_supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.other_supervisor.profile.save()
+        cls.other_supervisor = create_user('other_sup', UserProfile.ROLE_SUPERVISOR)
         
         # Create test shift
-        self.shift = DrillShift.objects.create(
-            created_by=self.supervisor,
+        cls.shift = DrillShift.objects.create(
+            created_by=cls.supervisor,
             date=date.today(),
             rig='Test Rig',
             location='Test Location',
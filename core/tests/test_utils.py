@@ -1,13 +1,28 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.http import HttpResponse
 from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+import tempfile
+from unittest import mock
+from django.core.management import call_command
 from core.models import DrillShift, DrillingProgress, MaterialUsed
 from accounts.models import UserProfile
+from core.tests.helpers import create_user
 from core.utils import (
     generate_shift_summary,
-    calculate_daily_progress
+    calculate_daily_progress,
+    export_monthly_boq,
+    export_shifts_to_csv,
+    iter_shifts_csv
+)
+from django.core.cache import cache
+from core.pdf_utils import (
+    generate_shift_pdf, generate_shift_pdfs, render_shift_pdf, shift_pdf_cache_key,
+    shift_pdf_filename, warm_shift_pdf_cache
 )
 
 User = get_user_model()
@@ -15,9 +30,7 @@ User = get_user_model()
 class ExportUtilsTest(TestCase):
     @classmethod
     def setUpTestData(cls):
-        cls.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        cls.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        cls.supervisor.profile.save()
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
 
         # Create test shifts spanning multiple days
         today = date.today()
@@ -67,6 +80,44 @@ class ExportUtilsTest(TestCase):
         self.assertEqual(summary['materials']['Diesel'], Decimal('100.00'))
         self.assertEqual(summary['materials']['Water'], Decimal('500.00'))
 
+    def test_generate_shift_summary_uses_loaded_totals(self):
+        """Test the summary reads annotated totals and prefetched materials without querying"""
+        shift = DrillShift.objects.with_totals().prefetch_related('materials').get(rig='Rig 1')
+        
+        with self.assertNumQueries(0):
+            summary = generate_shift_summary(shift)
+        self.assertEqual(summary['total_meters'], Decimal('5.50'))
+        self.assertEqual(summary['avg_penetration'], Decimal('2.75'))
+        self.assertEqual(summary['materials'], {'Diesel': Decimal('100.00'), 'Water': Decimal('500.00')})
+
+    def test_export_shifts_to_csv_query_count(self):
+        """Test the CSV export loads all shifts in a fixed number of queries"""
+        response = HttpResponse(content_type='text/csv')
+        
+        # Shifts with creators and totals, then their materials
+        with self.assertNumQueries(2):
+            export_shifts_to_csv(DrillShift.objects.all(), response)
+        
+        rows = response.content.decode().strip().splitlines()
+        self.assertEqual(len(rows), 4)
+        self.assertIn('5.50', rows[1])
+        self.assertIn('Diesel: 100.00', rows[1])
+
+    def test_iter_shifts_csv_matches_buffered_export(self):
+        """Test the streamed CSV lines add up to the buffered export"""
+        response = export_shifts_to_csv(DrillShift.objects.all(), HttpResponse(content_type='text/csv'))
+        streamed = ''.join(iter_shifts_csv(DrillShift.objects.all()))
+        self.assertEqual(streamed, response.content.decode())
+
+    def test_export_monthly_boq_query_count(self):
+        """Test the BOQ export summarises all shifts in a fixed number of queries"""
+        response = HttpResponse()
+        
+        # Summary sheet totals, then the materials sheet
+        with self.assertNumQueries(2):
+            export_monthly_boq(DrillShift.objects.all(), response)
+        self.assertTrue(response.content.startswith(b'PK'))
+
     def test_calculate_daily_progress(self):
         """Test daily progress calculations"""
         shifts = DrillShift.objects.all()
@@ -80,6 +131,18 @@ class ExportUtilsTest(TestCase):
             self.assertEqual(day_stat['total_meters'], Decimal('5.50'))
             self.assertEqual(day_stat['avg_penetration'], Decimal('2.75'))
 
+    def test_calculate_daily_progress_single_query(self):
+        """Test daily stats, including the running total, come from one query"""
+        with self.assertNumQueries(1):
+            stats = calculate_daily_progress(DrillShift.objects.all())
+        self.assertEqual([day['cumulative_meters'] for day in stats], [Decimal('5.50'), Decimal('11.00'), Decimal('16.50')])
+
+    def test_calculate_daily_progress_empty_skips_query(self):
+        """Test an empty list or none() queryset returns without a query"""
+        with self.assertNumQueries(0):
+            self.assertEqual(calculate_daily_progress([]), [])
+            self.assertEqual(calculate_daily_progress(DrillShift.objects.none()), [])
+
     def test_empty_shifts_handling(self):
         """Test handling of empty or invalid shifts"""
         DrillShift.objects.all().delete()
@@ -100,4 +163,92 @@ class ExportUtilsTest(TestCase):
         summary = generate_shift_summary(shift)
         self.assertEqual(summary['total_meters'], Decimal('0.00'))
         self.assertEqual(summary['avg_penetration'], Decimal('0.00'))
-        self.assertEqual(len(summary['materials']), 0)
\ No newline at end of file
+        self.assertEqual(len(summary['materials']), 0)
+
+    def test_generate_shift_pdf_uses_prefetched_data(self):
+        """Test PDF rendering runs no queries once the shift is loaded for it"""
+        shift = DrillShift.objects.for_pdf().get(rig='Rig 1')
+        
+        with self.assertNumQueries(0):
+            buffer = generate_shift_pdf(shift)
+        self.assertTrue(buffer.getvalue().startswith(b'%PDF'))
+
+    def test_render_shift_pdf_caches_locked_shifts(self):
+        """Test a locked shift's PDF is rendered once and then served from the cache"""
+        cache.clear()
+        shift = DrillShift.objects.get(rig='Rig 1')
+        shift.is_locked = True
+        shift.save()
+        
+        first = render_shift_pdf(shift).getvalue()
+        with self.assertNumQueries(0):
+            second = render_shift_pdf(shift).getvalue()
+        self.assertEqual(first, second)
+        
+        shift.is_locked = False
+        shift.save()
+        with self.assertNumQueries(6):
+            render_shift_pdf(shift)
+
+    def test_generate_shift_pdfs_loads_batch_once(self):
+        """Test batch PDF generation prefetches once for all shifts"""
+        shift_ids = list(DrillShift.objects.values_list('pk', flat=True))
+        
+        # One shift query plus one per prefetched relation, for the whole batch
+        with self.assertNumQueries(6):
+            pdfs = generate_shift_pdfs(shift_ids)
+        self.assertEqual(sorted(pdfs), sorted(shift_ids))
+        self.assertTrue(all(buffer.getvalue().startswith(b'%PDF') for buffer in pdfs.values()))
+
+    def test_warm_shift_pdf_cache_renders_locked_shifts_once(self):
+        """Test warming the cache renders each locked shift once and serves it afterwards"""
+        cache.clear()
+        DrillShift.objects.filter(rig='Rig 1').update(is_locked=True)
+        
+        self.assertEqual(warm_shift_pdf_cache(DrillShift.objects.all()), 1)
+        self.assertEqual(warm_shift_pdf_cache(DrillShift.objects.all()), 0)
+        
+        shift = DrillShift.objects.get(rig='Rig 1')
+        with self.assertNumQueries(0):
+            render_shift_pdf(shift)
+
+    def test_generate_shift_pdfs_writes_output_dir(self):
+        """Test batch PDF generation writes each PDF under its download name"""
+        shift = DrillShift.objects.get(rig='Rig 1')
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp) / 'reports'
+            paths = generate_shift_pdfs([shift.pk], output_dir=output_dir)
+            self.assertEqual(paths, {shift.pk: output_dir / shift_pdf_filename(shift)})
+            self.assertTrue(paths[shift.pk].read_bytes().startswith(b'%PDF'))
+
+    def test_warm_shift_pdf_cache_renders_only_misses(self):
+        """Test warming skips cached and unlocked shifts"""
+        cache.clear()
+        DrillShift.objects.filter(rig__in=['Rig 1', 'Rig 2']).update(is_locked=True)
+        cached = DrillShift.objects.get(rig='Rig 1')
+        render_shift_pdf(cached)
+        
+        self.assertEqual(warm_shift_pdf_cache(DrillShift.objects.all()), 1)
+        self.assertIsNotNone(cache.get(shift_pdf_cache_key(DrillShift.objects.get(rig='Rig 2'))))
+        self.assertIsNone(cache.get(shift_pdf_cache_key(DrillShift.objects.get(rig='Rig 3'))))
+
+    def test_warm_shift_pdfs_command_days(self):
+        """Test the warm_shift_pdfs command only renders shifts within --days"""
+        cache.clear()
+        DrillShift.objects.update(is_locked=True)
+        out = StringIO()
+        call_command('warm_shift_pdfs', days=1, stdout=out)
+        self.assertIn('Rendered 2 shift PDFs', out.getvalue())
+        
+        out = StringIO()
+        call_command('warm_shift_pdfs', days=0, stdout=out)
+        self.assertIn('Rendered 1 shift PDFs', out.getvalue())
+
+    def test_warm_shift_pdf_cache_fetches_keys_once(self):
+        """Test warming looks up all cached PDFs in a single get_many call"""
+        cache.clear()
+        DrillShift.objects.update(is_locked=True)
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            self.assertEqual(warm_shift_pdf_cache(DrillShift.objects.all()), 3)
+        get_many.assert_called_once()
+        self.assertEqual(len(get_many.call_args.args[0]), 3)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -6,46 +8,37 @@ from datetime import date
 from decimal import Decimal
 from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed, ApprovalHistory
 from accounts.models import UserProfile
+from core.tests.helpers import create_user
 
 User = get_user_model()
 
 class ShiftListViewTest(TestCase):
+    # User, shifts, prefetched progress and activities, hole numbers
+    SHIFT_LIST_QUERIES = 5
+
     @classmethod
     def setUpTestData(cls):
         # Create users with different roles
-        cls.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        cls.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        cls.supervisor.profile.save()
-        
-        cls.manager = User.objects.create_user(username='manager', password='test123')
-        cls.manager.profile.role = UserProfile.ROLE_MANAGER
-        cls.manager.profile.save()
-        
-        cls.client_user = User.objects.create_user(username='client', password='test123')
-        cls.client_user.profile.role = UserProfile.ROLE_CLIENT
-        cls.client_user.profile.save()
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
         
-        # Create some test shifts
-        cls.draft_shift = DrillShift.objects.create(
-            created_by=cls.supervisor,
-            date=date.today(),
-            rig='Rig 1',
-            status=DrillShift.STATUS_DRAFT
-        )
+        cls.manager = create_user('manager', UserProfile.ROLE_MANAGER)
         
-        cls.submitted_shift = DrillShift.objects.create(
-            created_by=cls.supervisor,
-            date=date.today(),
-            rig='Rig 2',
-            status=DrillShift.STATUS_SUBMITTED
-        )
+        cls.client_user = create_user('client', UserProfile.ROLE_CLIENT)
         
-        cls.approved_shift = DrillShift.objects.create(
-            created_by=cls.supervisor,
-            date=date.today(),
-            rig='Rig 3',
-            status=DrillShift.STATUS_APPROVED
-        )
+        # Create some test shifts in a single INSERT
+        cls.draft_shift, cls.submitted_shift, cls.approved_shift = DrillShift.objects.bulk_create([
+            DrillShift(
+                created_by=cls.supervisor,
+                date=date.today(),
+                rig=rig,
+                status=status,
+            )
+            for rig, status in (
+                ('Rig 1', DrillShift.STATUS_DRAFT),
+                ('Rig 2', DrillShift.STATUS_SUBMITTED),
+                ('Rig 3', DrillShift.STATUS_APPROVED),
+            )
+        ])
 
     def test_view_url_exists_at_desired_location(self):
         self.client.login(username='supervisor', password='test123')
@@ -64,35 +57,41 @@ class ShiftListViewTest(TestCase):
 
     def test_client_can_only_see_approved_shifts(self):
         self.client.login(username='client', password='test123')
-        response = self.client.get(reverse('core:shift_list'))
+        with self.assertNumQueries(self.SHIFT_LIST_QUERIES):
+            response = self.client.get(reverse('core:shift_list'))
         shifts = response.context['shifts']
-        self.assertEqual(shifts.count(), 1)
-        self.assertEqual(shifts.first(), self.approved_shift)
+        # Already evaluated by the view
+        with self.assertNumQueries(0):
+            self.assertEqual(shifts.count(), 1)
+            self.assertEqual(shifts.first(), self.approved_shift)
 
     def test_manager_can_see_submitted_and_approved_shifts(self):
         self.client.login(username='manager', password='test123')
-        response = self.client.get(reverse('core:shift_list'))
+        with self.assertNumQueries(self.SHIFT_LIST_QUERIES):
+            response = self.client.get(reverse('core:shift_list'))
         shifts = response.context['shifts']
-        self.assertEqual(shifts.count(), 2)
-        self.assertIn(self.submitted_shift, shifts)
-        self.assertIn(self.approved_shift, shifts)
+        # Already evaluated by the view
+        with self.assertNumQueries(0):
+            self.assertEqual(shifts.count(), 2)
+            self.assertIn(self.submitted_shift, shifts)
+            self.assertIn(self.approved_shift, shifts)
 
     def test_supervisor_can_see_own_drafts_and_others_submitted(self):
         self.client.login(username='supervisor', password='test123')
-        response = self.client.get(reverse('core:shift_list'))
+        with self.assertNumQueries(self.SHIFT_LIST_QUERIES):
+            response = self.client.get(reverse('core:shift_list'))
         shifts = response.context['shifts']
-        self.assertEqual(shifts.count(), 3)
+        # Already evaluated by the view
+        with self.assertNumQueries(0):
+            self.assertEqual(shifts.count(), 3)
         
 
 class ShiftCreateViewTest(TestCase):
-    def setUp(self):
-        self.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        self.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.supervisor.profile.save()
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
         
-        self.client_user = User.objects.create_user(username='client', password='test123')
-        self.client_user.profile.role = UserProfile.ROLE_CLIENT
-        self.client_user.profile.save()
+        cls.client_user = create_user('client', UserProfile.ROLE_CLIENT)
 
     def test_only_supervisor_can_create_shift(self):
         # Test client cannot access create view
@@ -155,4 +154,55 @@ class ShiftCreateViewTest(TestCase):
         # Check related objects
         self.assertEqual(shift.progress.count(), 1)
         self.assertEqual(shift.activities.count(), 1)
-        self.assertEqual(shift.materials.count(), 1)
\ No newline at end of file
+        self.assertEqual(shift.materials.count(), 1)
+
+
+class ExportQueryCountTest(TestCase):
+    """Export endpoints must not issue per-shift queries (N+1 guard)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = create_user('manager', UserProfile.ROLE_MANAGER)
+
+    def add_shifts(self, count):
+        for i in range(count):
+            shift = DrillShift.objects.create(
+                created_by=self.manager,
+                date=date.today(),
+                rig=f'Rig {i + 1}',
+                status=DrillShift.STATUS_APPROVED
+            )
+            DrillingProgress.objects.create(
+                shift=shift,
+                start_depth=Decimal('10.00'),
+                end_depth=Decimal('15.50'),
+                meters_drilled=Decimal('5.50'),
+                penetration_rate=Decimal('2.75')
+            )
+            MaterialUsed.objects.create(
+                shift=shift,
+                material_name='Diesel',
+                quantity=Decimal('100.00'),
+                unit='liters'
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        self.client.force_login(self.manager)
+        self.add_shifts(2)
+        baseline = self.count_queries(url)
+        self.add_shifts(5)
+        self.assertEqual(self.count_queries(url), baseline)
+
+    def test_export_shifts_queries_do_not_scale_with_shifts(self):
+        self.assert_constant_queries(reverse('core:export_shifts'))
+
+    def test_export_boq_queries_do_not_scale_with_shifts(self):
+        self.assert_constant_queries(reverse('core:export_boq'))
@@ -5,27 +5,23 @@ from datetime import date
 from decimal import Decimal
 from core.models import DrillShift, ApprovalHistory
 from accounts.models import UserProfile
+from core.tests.helpers import create_user
 
 User = get_user_model()
 
 class ApprovalWorkflowTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Create users with different roles
-        self.supervisor = User.objects.create_user(username='supervisor', password='test123')
-        self.supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        self.supervisor.profile.save()
+        cls.supervisor = create_user('supervisor', UserProfile.ROLE_SUPERVISOR)
         
-        self.manager = User.objects.create_user(username='manager', password='test123')
-        self.manager.profile.role = UserProfile.ROLE_MANAGER
-        self.manager.profile.save()
+        cls.manager = create_user('manager', UserProfile.ROLE_MANAGER)
         
-        self.client_user = User.objects.create_user(username='client', password='test123')
-        self.client_user.profile.role = UserProfile.ROLE_CLIENT
-        self.client_user.profile.save()
+        cls.client_user = create_user('client', UserProfile.ROLE_CLIENT)
         
         # Create a test shift
-        self.shift = DrillShift.objects.create(
-            created_by=self.supervisor,
+        cls.shift = DrillShift.objects.create(
+            created_by=cls.supervisor,
             date=date.today(),
             rig='Test Rig',
             status=DrillShift.STATUS_DRAFT
@@ -39,9 +35,7 @@ class ApprovalWorkflowTest(TestCase):
         self.assertEqual(response.status_code, 403)
         
         # Another supervisor can't submit
-        other_supervisor = User.objects.create_user(username='other_sup', password='test123')
-        other_supervisor.profile.role = UserProfile.ROLE_SUPERVISOR
-        other_supervisor.profile.save()
+        other_supervisor = create_user('other_sup', UserProfile.ROLE_SUPERVISOR)
         
         self.client.login(username='other_sup', password='test123')
         response = self.client.post(reverse('core:shift_submit', args=[self.shift.pk]))
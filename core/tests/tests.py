@@ -8,9 +8,10 @@ from core.models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed,
 
 
 class DrillModelsTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         User = get_user_model()
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
@@ -7,29 +7,50 @@ and calculating drilling progress statistics.
 import csv
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Dict, Any
+from itertools import islice
+from typing import Any, Dict, Iterator, List
 import xlsxwriter
-from django.db.models import Sum, Avg, F
-from django.db import connection
-try:
-    # Window may not be available/usable on all DB backends (older SQLite)
-    from django.db.models import Window
-except Exception:
-    Window = None
-from django.db.models.functions import TruncDate
+from django.db.models import Avg, DecimalField, F, QuerySet, Sum
+from django.db.models.functions import Coalesce
 from django.http import HttpResponse
 from .models import DrillShift, DrillingProgress, MaterialUsed, Alert
 
+def _filter_shifts(shifts) -> 'QuerySet[DrillShift]':
+    """Plain DrillShift queryset over ``shifts`` for grouping/aggregating.
+
+    A queryset is applied as a ``pk__in`` subquery, so its filters (or any
+    slicing, annotations and ordering) never leak into the GROUP BY and
+    nothing is evaluated in Python. A list of shifts is still accepted.
+    """
+    if isinstance(shifts, QuerySet):
+        return DrillShift.objects.filter(pk__in=shifts.values('pk'))
+    return DrillShift.objects.filter(pk__in=[s.pk for s in shifts])
+
 def generate_shift_summary(shift: DrillShift) -> Dict[str, Any]:
-    """Generate summary statistics for a single shift."""
-    progress_data = shift.progress.aggregate(
-        total_meters=Sum('meters_drilled'),
-        avg_penetration=Avg('penetration_rate')
-    )
+    """Generate summary statistics for a single shift.
+
+    Uses the ``total_meters``/``avg_rop`` annotations from
+    ``DrillShift.objects.with_totals()`` and prefetched materials when the
+    shift carries them; otherwise runs one aggregate and one grouped query.
+    """
+    if hasattr(shift, 'total_meters') and hasattr(shift, 'avg_rop'):
+        progress_data = {'total_meters': shift.total_meters, 'avg_penetration': shift.avg_rop}
+    else:
+        progress_data = shift.progress.aggregate(
+            total_meters=Sum('meters_drilled'),
+            avg_penetration=Avg('penetration_rate')
+        )
     
-    material_data = shift.materials.values('material_name').annotate(
-        total_quantity=Sum('quantity')
-    )
+    if 'materials' in getattr(shift, '_prefetched_objects_cache', {}):
+        materials = {}
+        for material in shift.materials.all():
+            materials[material.material_name] = materials.get(material.material_name, 0) + material.quantity
+    else:
+        materials = dict(
+            shift.materials.values_list('material_name').annotate(
+                total_quantity=Sum('quantity')
+            )
+        )
     
     return {
         'shift_id': shift.id,
@@ -38,93 +59,147 @@ def generate_shift_summary(shift: DrillShift) -> Dict[str, Any]:
         'rig': shift.rig,
         'total_meters': progress_data['total_meters'] or Decimal('0.00'),
         'avg_penetration': progress_data['avg_penetration'] or Decimal('0.00'),
-        'materials': {
-            item['material_name']: item['total_quantity']
-            for item in material_data
-        }
+        'materials': materials,
     }
 
-def export_shifts_to_csv(shifts: List[DrillShift], response: HttpResponse) -> HttpResponse:
+CSV_HEADER = [
+    'Shift ID', 'Date', 'Location', 'Rig', 
+    'Total Meters', 'Avg. Penetration Rate',
+    'Status', 'Created By', 'Materials Used'
+]
+
+# Shifts fetched per round trip when streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+STATUS_DISPLAY = dict(DrillShift.STATUS_CHOICES)
+
+
+def _materials_by_shift(shift_ids) -> Dict[int, str]:
+    """``"name: qty"`` text per shift, with quantities summed by material name."""
+    materials = {}
+    rows = MaterialUsed.objects.filter(shift_id__in=shift_ids).values_list(
+        'shift_id', 'material_name'
+    ).annotate(total=Sum('quantity')).order_by('shift_id', 'material_name')
+    for shift_id, name, total in rows:
+        # SQLite hands back the raw SUM; print it at the field's 3 places
+        # like the PostgreSQL numeric result
+        materials.setdefault(shift_id, []).append(f"{name}: {total.quantize(Decimal('0.001'))}")
+    return {shift_id: ', '.join(items) for shift_id, items in materials.items()}
+
+def _shift_csv_rows(shifts):
+    """Yield one CSV row per shift.
+
+    Shifts are read in chunks as plain dicts (no model instances) carrying
+    the creator's username and the progress totals; each chunk's materials
+    come from one grouped query. Nothing is computed per shift and the
+    shifts are never all held in memory at once.
+    """
+    if not isinstance(shifts, QuerySet):
+        shifts = _filter_shifts(shifts)
+    if not shifts.query.order_by:
+        # Grouped values() queries drop Meta.ordering; keep the export order
+        shifts = shifts.order_by(*DrillShift._meta.ordering)
+    rows = shifts.values(
+        'id', 'date', 'location', 'rig', 'status', 'created_by__username',
+    ).with_totals().iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    
+    while chunk := list(islice(rows, EXPORT_CHUNK_SIZE)):
+        materials = _materials_by_shift([shift['id'] for shift in chunk])
+        for shift in chunk:
+            yield [
+                shift['id'],
+                shift['date'].strftime('%Y-%m-%d'),
+                shift['location'],
+                shift['rig'],
+                f"{shift['total_meters']:.2f}",
+                f"{shift['avg_rop'] or Decimal('0.00'):.2f}",
+                STATUS_DISPLAY.get(shift['status'], shift['status']),
+                shift['created_by__username'],
+                materials.get(shift['id'], '')
+            ]
+
+def export_shifts_to_csv(shifts: 'QuerySet[DrillShift]', response: HttpResponse) -> HttpResponse:
     """Export shifts data to CSV format."""
     writer = csv.writer(response)
-    
-    # Write header
-    writer.writerow([
-        'Shift ID', 'Date', 'Location', 'Rig', 
-        'Total Meters', 'Avg. Penetration Rate',
-        'Status', 'Created By', 'Materials Used'
-    ])
-    
-    # Write data rows
-    for shift in shifts:
-        summary = generate_shift_summary(shift)
-        materials_str = ', '.join(
-            f"{name}: {qty}" 
-            for name, qty in summary['materials'].items()
-        )
-        
-        writer.writerow([
-            shift.id,
-            shift.date.strftime('%Y-%m-%d'),
-            shift.location,
-            shift.rig,
-            f"{summary['total_meters']:.2f}",
-            f"{summary['avg_penetration']:.2f}",
-            shift.get_status_display(),
-            shift.created_by.username,
-            materials_str
-        ])
-    
+    writer.writerow(CSV_HEADER)
+    writer.writerows(_shift_csv_rows(shifts))
     return response
 
-def export_monthly_boq(shifts: List[DrillShift], response: HttpResponse) -> HttpResponse:
+class _Echo:
+    """File-like object whose write() hands the formatted line back."""
+
+    def write(self, value):
+        return value
+
+def iter_shifts_csv(shifts: 'QuerySet[DrillShift]') -> Iterator[str]:
+    """Yield the CSV export line by line, for a StreamingHttpResponse."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in _shift_csv_rows(shifts):
+        yield writer.writerow(row)
+
+# BOQ workbook formats and (column range, width, header) layouts; built once
+# at import rather than as literals on every export
+BOQ_HEADER_STYLE = {
+    'bold': True,
+    'align': 'center',
+    'valign': 'vcenter',
+    'bg_color': '#4F81BD',
+    'font_color': 'white',
+    'border': 1
+}
+BOQ_DATE_STYLE = {'num_format': 'yyyy-mm-dd', 'border': 1}
+BOQ_NUMBER_STYLE = {'num_format': '#,##0.00', 'border': 1}
+BOQ_BORDER_STYLE = {'border': 1}
+
+BOQ_SUMMARY_COLUMNS = (
+    ('A:A', 12, 'Date'),
+    ('B:B', 15, 'Location'),
+    ('C:C', 10, 'Rig'),
+    ('D:D', 15, 'Total Meters'),
+    ('E:E', 20, 'Avg. Penetration'),
+)
+BOQ_MATERIAL_COLUMNS = (
+    ('A:A', 25, 'Material'),
+    ('B:B', 15, 'Total Quantity'),
+    ('C:C', 10, 'Unit'),
+)
+
+
+def _write_boq_header(worksheet, columns, header_style) -> None:
+    """Set column widths and write the header row for a BOQ sheet."""
+    for col, (col_range, width, header) in enumerate(columns):
+        worksheet.set_column(col_range, width)
+        worksheet.write(0, col, header, header_style)
+
+def export_monthly_boq(shifts: 'QuerySet[DrillShift]', response: HttpResponse) -> HttpResponse:
     """Export monthly BOQ report to Excel."""
-    workbook = xlsxwriter.Workbook(response)
-    
-    # Styles
-    header_style = workbook.add_format({
-        'bold': True,
-        'align': 'center',
-        'valign': 'vcenter',
-        'bg_color': '#4F81BD',
-        'font_color': 'white',
-        'border': 1
-    })
-    
-    date_style = workbook.add_format({
-        'num_format': 'yyyy-mm-dd',
-        'border': 1
-    })
+    # Rows are written strictly top to bottom on each sheet, so each row can
+    # be flushed to a temp file as soon as the next one starts
+    workbook = xlsxwriter.Workbook(response, {'constant_memory': True})
     
-    number_style = workbook.add_format({
-        'num_format': '#,##0.00',
-        'border': 1
-    })
-    
-    border_style = workbook.add_format({
-        'border': 1
-    })
+    header_style = workbook.add_format(BOQ_HEADER_STYLE)
+    date_style = workbook.add_format(BOQ_DATE_STYLE)
+    number_style = workbook.add_format(BOQ_NUMBER_STYLE)
+    border_style = workbook.add_format(BOQ_BORDER_STYLE)
     
     # Summary Sheet
     ws_summary = workbook.add_worksheet('Summary')
-    ws_summary.set_column('A:A', 12)  # Date
-    ws_summary.set_column('B:B', 15)  # Location
-    ws_summary.set_column('C:C', 10)  # Rig
-    ws_summary.set_column('D:D', 15)  # Total Meters
-    ws_summary.set_column('E:E', 20)  # Avg. Penetration
+    _write_boq_header(ws_summary, BOQ_SUMMARY_COLUMNS, header_style)
     
-    # Write headers
-    headers = ['Date', 'Location', 'Rig', 'Total Meters', 'Avg. Penetration']
-    for col, header in enumerate(headers):
-        ws_summary.write(0, col, header, header_style)
+    # Per-shift totals for the summary sheet, all from one grouped query
+    meters_field = DecimalField(max_digits=10, decimal_places=2)
+    summaries = _filter_shifts(shifts).values('id', 'date', 'location', 'rig').annotate(
+        total_meters=Coalesce(Sum('progress__meters_drilled'), Decimal('0.00'), output_field=meters_field),
+        avg_penetration=Coalesce(Avg('progress__penetration_rate'), Decimal('0.00'), output_field=meters_field),
+    ).order_by('-date', '-id')
     
     # Write summary data
     row = 1
-    for shift in shifts:
-        summary = generate_shift_summary(shift)
-        ws_summary.write_datetime(row, 0, shift.date, date_style)
-        ws_summary.write(row, 1, shift.location, border_style)
-        ws_summary.write(row, 2, shift.rig, border_style)
+    for summary in summaries:
+        ws_summary.write_datetime(row, 0, summary['date'], date_style)
+        ws_summary.write(row, 1, summary['location'], border_style)
+        ws_summary.write(row, 2, summary['rig'], border_style)
         ws_summary.write_number(row, 3, float(summary['total_meters']), number_style)
         ws_summary.write_number(row, 4, float(summary['avg_penetration']), number_style)
         row += 1
@@ -136,14 +211,7 @@ def export_monthly_boq(shifts: List[DrillShift], response: HttpResponse) -> Http
     
     # Materials Sheet
     ws_materials = workbook.add_worksheet('Materials')
-    ws_materials.set_column('A:A', 25)  # Material Name
-    ws_materials.set_column('B:B', 15)  # Total Quantity
-    ws_materials.set_column('C:C', 10)  # Unit
-    
-    # Write headers
-    material_headers = ['Material', 'Total Quantity', 'Unit']
-    for col, header in enumerate(material_headers):
-        ws_materials.write(0, col, header, header_style)
+    _write_boq_header(ws_materials, BOQ_MATERIAL_COLUMNS, header_style)
     
     # Aggregate materials data
     materials_summary = MaterialUsed.objects.filter(
@@ -165,52 +233,31 @@ def export_monthly_boq(shifts: List[DrillShift], response: HttpResponse) -> Http
     workbook.close()
     return response
 
-def calculate_daily_progress(shifts: List[DrillShift]) -> Dict[str, Any]:
-    """Calculate daily drilling progress statistics."""
-    qs = DrillShift.objects.filter(id__in=[s.id for s in shifts]).annotate(
-        date_truncated=TruncDate('date')
-    ).values('date_truncated').annotate(
-        total_meters=Sum('progress__meters_drilled'),
-        avg_penetration=Avg('progress__penetration_rate')
-    ).order_by('date_truncated')
+def calculate_daily_progress(shifts: 'QuerySet[DrillShift]') -> List[Dict[str, Any]]:
+    """Calculate daily drilling progress statistics.
 
-    # SQLite (test DB) may not support advanced DB functions consistently; compute in Python
-    if connection.vendor == 'sqlite' or Window is None:
-        # Build simple aggregated stats in Python to avoid database-specific functions
-        daily = {}
-        for s in shifts:
-            d = s.date
-            if d not in daily:
-                daily[d] = {'date_truncated': d, 'total_meters': Decimal('0.00'), 'avg_penetration_sum': Decimal('0.00'), 'count': 0}
-            # sum progress meters and penetration rates
-            for p in s.progress.all():
-                meters = p.meters_drilled or Decimal('0.00')
-                daily[d]['total_meters'] += meters
-                if p.penetration_rate is not None:
-                    daily[d]['avg_penetration_sum'] += p.penetration_rate
-                    daily[d]['count'] += 1
-
-        results = []
-        for d in sorted(daily.keys()):
-            entry = daily[d]
-            avg_pen = (entry['avg_penetration_sum'] / entry['count']) if entry['count'] > 0 else Decimal('0.00')
-            results.append({'date_truncated': entry['date_truncated'], 'total_meters': entry['total_meters'], 'avg_penetration': avg_pen})
-        return results
-
-    # For DBs that support window functions, annotate cumulative meters
-    daily_stats = DrillShift.objects.filter(id__in=[s.id for s in shifts]).annotate(
-        date_truncated=TruncDate('date')
-    ).values('date_truncated').annotate(
-        total_meters=Sum('progress__meters_drilled'),
-        avg_penetration=Avg('progress__penetration_rate'),
-        cumulative_meters=Window(
-            expression=Sum('progress__meters_drilled'),
-            order_by=F('date_truncated').asc(),
-        )
-    ).order_by('date_truncated')
+    The per-day totals and averages come from one GROUP BY query; the running
+    total is added while walking the (already date-ordered) rows.
+    """
+    # Nothing to aggregate: skip the query entirely. An unevaluated queryset
+    # is not probed with exists(), which would cost a query of its own.
+    empty = shifts.query.is_empty() if isinstance(shifts, QuerySet) else not shifts
+    if empty:
+        return []
 
-    return daily_stats
+    meters_field = DecimalField(max_digits=10, decimal_places=2)
+    daily_stats = _filter_shifts(shifts).values(date_truncated=F('date')).annotate(
+        total_meters=Coalesce(Sum('progress__meters_drilled'), Decimal('0.00'), output_field=meters_field),
+        avg_penetration=Coalesce(Avg('progress__penetration_rate'), Decimal('0.00'), output_field=meters_field),
+    ).order_by('date_truncated')
 
+    results = []
+    cumulative_meters = Decimal('0.00')
+    for day in daily_stats:
+        cumulative_meters += day['total_meters']
+        day['cumulative_meters'] = cumulative_meters
+        results.append(day)
+    return results
 
 def evaluate_shift_alerts(shift: DrillShift) -> None:
     """Generate Alert records for a newly approved shift based on KPIs.
@@ -227,15 +274,26 @@ def evaluate_shift_alerts(shift: DrillShift) -> None:
     if shift.status != DrillShift.STATUS_APPROVED:
         return
 
-    progress_qs = shift.progress.all()
-    if not progress_qs.exists():
+    # Evaluate the progress rows once; the averages below are taken from this
+    # list (NULLs skipped, as with Avg) rather than with one query each
+    progress_rows = list(shift.progress.all())
+    if not progress_rows:
         return
 
+    def average(values):
+        values = [v for v in values if v is not None]
+        return sum(values) / len(values) if values else 0
+
+    # One query for the alert types already raised, instead of one per check
+    active_types = set(
+        Alert.objects.filter(shift=shift, is_active=True).values_list('alert_type', flat=True)
+    )
+
     def already_exists(alert_type: str) -> bool:
-        return Alert.objects.filter(shift=shift, alert_type=alert_type, is_active=True).exists()
+        return alert_type in active_types
 
     # Average recovery
-    avg_recovery = progress_qs.aggregate(r=Avg('recovery_percentage'))['r'] or 0
+    avg_recovery = average(p.recovery_percentage for p in progress_rows)
     if avg_recovery and avg_recovery < 90 and not already_exists(Alert.ALERT_RECOVERY):
         Alert.objects.create(
             shift=shift,
@@ -255,7 +313,7 @@ def evaluate_shift_alerts(shift: DrillShift) -> None:
                       .first())
         if prev_shift:
             prev_avg_rop = prev_shift.progress.aggregate(a=Avg('penetration_rate'))['a'] or 0
-            curr_avg_rop = progress_qs.aggregate(a=Avg('penetration_rate'))['a'] or 0
+            curr_avg_rop = average(p.penetration_rate for p in progress_rows)
             if prev_avg_rop and curr_avg_rop and curr_avg_rop < prev_avg_rop * Decimal('0.70') and not already_exists(Alert.ALERT_ROP_DROP):
                 drop_pct = (1 - (Decimal(str(curr_avg_rop)) / Decimal(str(prev_avg_rop)))) * 100
                 Alert.objects.create(
@@ -283,8 +341,8 @@ def evaluate_shift_alerts(shift: DrillShift) -> None:
         )
 
     # Bit failure warning (heuristic)
-    avg_rop_current = progress_qs.aggregate(a=Avg('penetration_rate'))['a'] or 0
-    low_runs = [p for p in progress_qs if p.penetration_rate and p.penetration_rate < max(0.5, float(avg_rop_current) * 0.3)]
+    avg_rop_current = average(p.penetration_rate for p in progress_rows)
+    low_runs = [p for p in progress_rows if p.penetration_rate and p.penetration_rate < max(0.5, float(avg_rop_current) * 0.3)]
     if low_runs and not already_exists(Alert.ALERT_BIT_FAILURE):
         worst = min([float(p.penetration_rate) for p in low_runs]) if low_runs else 0
         Alert.objects.create(
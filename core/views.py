@@ -2,18 +2,21 @@ from datetime import datetime, timedelta
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum, Avg, Q, Count, F
+from django.db import transaction
+from django.db.models import Sum, Avg, Q, Count, F, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse, FileResponse, JsonResponse
+from django.http import HttpResponse, FileResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from decimal import Decimal
 import json
 from .models import DrillShift, DrillingProgress, ActivityLog, MaterialUsed, ApprovalHistory, Client, Alert
 from .forms import (DrillShiftForm, DrillingProgressFormSet, ActivityLogFormSet, 
                     MaterialUsedFormSet, SurveyFormSet, CasingFormSet)
-from .utils import export_shifts_to_csv, export_monthly_boq, calculate_daily_progress
+from .utils import iter_shifts_csv, export_monthly_boq, calculate_daily_progress, evaluate_shift_alerts
 from accounts.decorators import role_required
+from accounts.utils import get_profile
 from accounts.decorators import (
     supervisor_required, manager_required, supervisor_or_manager_required,
     can_approve_shifts
@@ -191,7 +194,6 @@ def home_dashboard(request):
     off_target_alerts = Alert.objects.filter(is_active=True, severity__in=[Alert.SEVERITY_HIGH, Alert.SEVERITY_CRITICAL]).select_related('shift').order_by('-created_at')[:8]
 
     # Placeholder average days metrics (requires timestamps/more history) - derive from approval history if available
-    from django.db.models import Min
     approvals = ApprovalHistory.objects.filter(shift__in=shifts_month_qs, decision=ApprovalHistory.DECISION_APPROVED).values('shift_id').annotate(first_approved=Min('timestamp'))
     # Map for quick lookup
     approved_map = {a['shift_id']: a['first_approved'] for a in approvals}
@@ -453,7 +455,7 @@ def shift_list(request):
     
     # Apply role-based filters
     if not request.user.is_superuser:
-        profile = request.user.profile
+        profile = get_profile(request)
         if profile.is_client:
             # Clients can only see approved shifts
             shifts = shifts.filter(status=DrillShift.STATUS_APPROVED)
@@ -502,6 +504,7 @@ def shift_list(request):
     ).values_list('hole_number', flat=True).distinct().order_by('hole_number')
     
     context = {
+        'shifts': shifts,
         'shift_groups': shift_groups,
         'status_choices': DrillShift.STATUS_CHOICES,
         'hole_numbers': list(all_hole_numbers),
@@ -529,14 +532,10 @@ def shift_detail(request, pk):
         Http404: If shift with given pk doesn't exist
         Redirect: If user doesn't have permission to view the shift
     """
-    shift = get_object_or_404(
-        DrillShift.objects.select_related('created_by')
-        .prefetch_related('progress', 'activities', 'materials', 'approvals'),
-        pk=pk
-    )
+    shift = get_object_or_404(DrillShift.objects.with_related(), pk=pk)
     
     # Check permissions based on role
-    profile = request.user.profile
+    profile = get_profile(request)
     if not request.user.is_superuser:
         if profile.is_client and shift.status != DrillShift.STATUS_APPROVED:
             messages.error(request, 'You can only view approved shifts.')
@@ -548,19 +547,15 @@ def shift_detail(request, pk):
             messages.error(request, 'You cannot view draft shifts.')
             return redirect('core:shift_list')
     
-    # Calculate summary data for current shift
-    total_meters = shift.progress.aggregate(
-        total=Sum('meters_drilled')
-    )['total'] or 0
+    # Calculate summary data for current shift (from the prefetched rows)
+    total_meters = shift.get_total_meters_drilled()
     
-    # Calculate total activity hours
-    total_activity_minutes = shift.activities.aggregate(
-        total=Sum('duration_minutes')
-    )['total'] or 0
+    # Calculate total activity hours (from the prefetched rows)
+    total_activity_minutes = sum(activity.duration_minutes or 0 for activity in shift.activities.all())
     total_activity_hours = round(total_activity_minutes / 60, 1) if total_activity_minutes else 0
     
     # Get shift hours
-    shift_hours = shift.get_shift_hours()
+    shift_hours = shift.shift_hours
     
     # Calculate man hours (simplified - could be enhanced with actual crew count)
     total_man_hours = round(shift_hours * 2, 1)  # Assuming 2 people per shift, rounded to 1 decimal
@@ -572,26 +567,28 @@ def shift_detail(request, pk):
     companion_man_hours = 0
     
     if shift.date and shift.rig:
-        # Find the opposite shift type for the same date and rig
+        # Find the opposite shift type for the same date and rig, with its
+        # totals summed in the same query
         opposite_shift_type = 'night' if shift.shift_type == 'day' else 'day'
+        activity_minutes = ActivityLog.objects.filter(shift=OuterRef('pk')).values('shift').annotate(
+            total=Sum('duration_minutes')
+        ).values('total')
         companion_shift = DrillShift.objects.filter(
             date=shift.date,
             rig=shift.rig,
             shift_type=opposite_shift_type
-        ).select_related('created_by').prefetch_related('progress', 'activities').first()
+        ).with_totals().annotate(
+            total_activity_minutes=Coalesce(Subquery(activity_minutes), 0)
+        ).first()
         
         if companion_shift:
             # Calculate companion shift metrics
-            companion_meters = companion_shift.progress.aggregate(
-                total=Sum('meters_drilled')
-            )['total'] or 0
+            companion_meters = companion_shift.total_meters
             
-            companion_activity_minutes = companion_shift.activities.aggregate(
-                total=Sum('duration_minutes')
-            )['total'] or 0
+            companion_activity_minutes = companion_shift.total_activity_minutes
             companion_activity_hours = round(companion_activity_minutes / 60, 1) if companion_activity_minutes else 0
             
-            companion_shift_hours = companion_shift.get_shift_hours()
+            companion_shift_hours = companion_shift.shift_hours
             companion_man_hours = round(companion_shift_hours * 2, 1)
     
     # Calculate 24-hour totals
@@ -664,7 +661,6 @@ def shift_create(request):
             and survey_formset.is_valid() and casing_formset.is_valid()):
             
             # Use transaction to ensure all saves succeed or none do
-            from django.db import transaction
             try:
                 with transaction.atomic():
                     shift = form.save(commit=False)
@@ -767,7 +763,6 @@ def shift_update(request, pk):
             and survey_formset.is_valid() and casing_formset.is_valid()):
             
             # Use transaction to ensure all updates succeed or none do
-            from django.db import transaction
             try:
                 with transaction.atomic():
                     form.save()
@@ -903,7 +898,6 @@ def shift_approve(request, pk):
 
             # Generate alerts when shift is approved
             if shift.status == DrillShift.STATUS_APPROVED:
-                from .utils import evaluate_shift_alerts
                 try:
                     evaluate_shift_alerts(shift)
                 except Exception as e:
@@ -914,7 +908,7 @@ def shift_approve(request, pk):
             ApprovalHistory.objects.create(
                 shift=shift,
                 approver=request.user,
-                role=request.user.profile.get_role_display(),
+                role=get_profile(request).get_role_display(),
                 decision=decision,
                 comments=comments
             )
@@ -956,7 +950,7 @@ def export_shifts(request):
     
     # Apply role-based filters
     if not request.user.is_superuser:
-        profile = request.user.profile
+        profile = get_profile(request)
         if profile.is_client:
             shifts = shifts.filter(status=DrillShift.STATUS_APPROVED)
         elif profile.is_supervisor:
@@ -981,11 +975,11 @@ def export_shifts(request):
             messages.error(request, 'Invalid date format. Use YYYY-MM-DD.')
             return redirect('core:shift_list')
     
-    # Create the response
-    response = HttpResponse(content_type='text/csv')
+    # Stream the rows as they are read instead of building the whole file
+    response = StreamingHttpResponse(iter_shifts_csv(shifts), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="shifts.csv"'
     
-    return export_shifts_to_csv(shifts, response)
+    return response
 
 
 @login_required
@@ -1015,7 +1009,7 @@ def export_boq(request):
     
     # Apply role-based filters
     if not request.user.is_superuser:
-        profile = request.user.profile
+        profile = get_profile(request)
         if profile.is_client:
             shifts = shifts.filter(status=DrillShift.STATUS_APPROVED)
         elif profile.is_supervisor:
@@ -1093,7 +1087,7 @@ def client_dashboard(request):
     shifts = DrillShift.objects.filter(
         client=client,
         status=DrillShift.STATUS_APPROVED  # Only show manager-approved shifts
-    ).select_related('created_by', 'client').prefetch_related('progress').order_by('-date')
+    ).select_related('created_by', 'client').with_totals().order_by('-date')
     
     # Filter by client status
     client_status = request.GET.get('client_status', '')
@@ -1189,13 +1183,9 @@ def shift_pdf_export(request, pk):
     Returns:
         PDF file response
     """
-    from .pdf_utils import generate_shift_pdf
+    from .pdf_utils import render_shift_pdf, shift_pdf_filename
     
-    shift = get_object_or_404(
-        DrillShift.objects.select_related('created_by', 'client')
-        .prefetch_related('progress', 'activities', 'materials', 'surveys', 'casings'),
-        pk=pk
-    )
+    shift = get_object_or_404(DrillShift.objects.select_related('client', 'created_by'), pk=pk)
     
     # Check permissions - user must be creator, staff, or client with access
     if not (shift.created_by == request.user or 
@@ -1204,11 +1194,11 @@ def shift_pdf_export(request, pk):
         messages.error(request, 'You do not have permission to export this shift.')
         return redirect('core:shift_list')
     
-    # Generate PDF
-    pdf_buffer = generate_shift_pdf(shift)
+    # Generate PDF (served from the cache for locked shifts)
+    pdf_buffer = render_shift_pdf(shift)
     
     # Create filename
-    filename = f"Shift_Report_{shift.date.strftime('%Y%m%d')}_{shift.rig.replace(' ', '_')}_{shift.get_shift_type_display()}.pdf"
+    filename = shift_pdf_filename(shift)
     
     # Return PDF response
     response = FileResponse(pdf_buffer, content_type='application/pdf')